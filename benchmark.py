@@ -0,0 +1,447 @@
+"""
+Performance benchmarks for the docscanner package.
+
+Usage:
+    python benchmark.py <name> [--image images/1.png] [--video clip.mp4] [--iterations 50] [-l LICENSE]
+
+Available benchmarks are listed by ``python benchmark.py --help``.
+"""
+
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+import docscanner
+from docscanner import *
+
+DEFAULT_LICENSE = "DLS2eyJoYW5kc2hha2VDb2RlIjoiMjAwMDAxLTE2NDk4Mjk3OTI2MzUiLCJvcmdhbml6YXRpb25JRCI6IjIwMDAwMSIsInNlc3Npb25QYXNzd29yZCI6IndTcGR6Vm05WDJrcEQ5YUoifQ=="
+
+
+def timed(func, iterations):
+    """Run func() iterations times and return the elapsed wall-clock seconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return time.perf_counter() - start
+
+
+def bench_router_pool(args):
+    """Throughput of one shared scanner as the number of calling threads grows."""
+    image = cv2.imread(args.image)
+    max_threads = os.cpu_count() or 1
+    scanner = docscanner.createInstance(pool_size=max_threads)
+
+    # Warm every router up front so creation cost is not measured.
+    for _ in range(max_threads):
+        scanner.detect(image)
+
+    print('threads  images/s  speedup')
+    baseline = None
+    threads = 1
+    while True:
+        total = args.iterations * threads
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            start = time.perf_counter()
+            list(executor.map(lambda _: scanner.detect(image), range(total)))
+            elapsed = time.perf_counter() - start
+
+        throughput = total / elapsed
+        if baseline is None:
+            baseline = throughput
+        print('{:7d}  {:8.1f}  {:6.2f}x'.format(threads, throughput, throughput / baseline))
+
+        if threads == max_threads:
+            break
+        threads = min(threads * 2, max_threads)
+
+
+def bench_parallel(args):
+    """Thread-based detect_batch versus the process-pool engine at growing worker counts."""
+    from docscanner.parallel import ParallelScanner
+
+    paths = [args.image] * args.iterations
+    max_workers = os.cpu_count() or 1
+    scanner = docscanner.createInstance(pool_size=max_workers)
+
+    print('workers  threads img/s  processes img/s')
+    workers = 1
+    while True:
+        start = time.perf_counter()
+        for _ in scanner.detect_batch(paths, workers=workers):
+            pass
+        thread_throughput = len(paths) / (time.perf_counter() - start)
+
+        with ParallelScanner(args.license, workers=workers) as engine:
+            # Let every worker finish its license and router warm-up first.
+            for _ in engine.detect_batch([args.image] * workers):
+                pass
+            start = time.perf_counter()
+            for _ in engine.detect_batch(paths):
+                pass
+            process_throughput = len(paths) / (time.perf_counter() - start)
+
+        print('{:7d}  {:13.1f}  {:15.1f}'.format(workers, thread_throughput, process_throughput))
+
+        if workers == max_workers:
+            break
+        workers = min(workers * 2, max_workers)
+
+
+def bench_detect_and_normalize(args):
+    """Per-image latency of detect() + normalize() versus one detectAndNormalize()."""
+    scanner = docscanner.createInstance()
+    colour = EnumImageColourMode.ICM_COLOUR
+
+    def two_pass():
+        for result in scanner.detect(args.image):
+            scanner.normalize(result, colour)
+
+    def single_pass():
+        scanner.detectAndNormalize(args.image, colour)
+
+    two_pass()
+    single_pass()
+    two_pass_ms = timed(two_pass, args.iterations) * 1000 / args.iterations
+    single_pass_ms = timed(single_pass, args.iterations) * 1000 / args.iterations
+
+    print('detect + normalize:  {:8.2f} ms/image'.format(two_pass_ms))
+    print('detectAndNormalize:  {:8.2f} ms/image'.format(single_pass_ms))
+    print('saved:               {:8.2f} ms/image'.format(two_pass_ms - single_pass_ms))
+
+
+def bench_normalize_settings(args):
+    """Normalizations per second with rebuilt versus cached normalize settings."""
+    scanner = docscanner.createInstance(pool_size=1)
+    results = scanner.detect(cv2.imread(args.image))
+    if not results:
+        print('No document found in', args.image)
+        return
+    result = results[0]
+    colours = [EnumImageColourMode.ICM_COLOUR, EnumImageColourMode.ICM_GRAYSCALE]
+
+    def rebuilt():
+        # Dropping the caches reproduces the old get/build/update round-trip.
+        scanner._template_settings.clear()
+        scanner._pushed_settings.clear()
+        scanner.normalize(result, colours[0])
+
+    def cached_same_roi():
+        scanner.normalize(result, colours[0])
+
+    def cached_alternating():
+        for colour in colours:
+            scanner.normalize(result, colour)
+
+    for name, func, calls in [('rebuilt every call', rebuilt, 1),
+                              ('cached, same ROI', cached_same_roi, 1),
+                              ('cached, alternating', cached_alternating, len(colours))]:
+        func()
+        elapsed = timed(func, args.iterations)
+        print('{:22s} {:8.1f} normalizations/s'.format(name, args.iterations * calls / elapsed))
+
+
+def bench_normalize_many(args):
+    """Latency of a normalize() loop versus normalize_many() as documents per image grow."""
+    scanner = docscanner.createInstance()
+    tile = cv2.imread(args.image)
+    colour = EnumImageColourMode.ICM_COLOUR
+
+    print('documents  loop ms  normalize_many ms')
+    for count in (1, 2, 4, 8):
+        # Place copies of the sample side by side to build a multi-document scene.
+        path = 'bench_multi_{}.png'.format(count)
+        cv2.imwrite(path, np.hstack([tile] * count))
+        results = scanner.detect(path)
+
+        def loop():
+            for result in results:
+                scanner.normalize(result, colour)
+
+        def many():
+            scanner.normalize_many(results, colour)
+
+        loop()
+        many()
+        loop_ms = timed(loop, args.iterations) * 1000 / args.iterations
+        many_ms = timed(many, args.iterations) * 1000 / args.iterations
+        print('{:9d}  {:7.1f}  {:17.1f}'.format(len(results), loop_ms, many_ms))
+        os.remove(path)
+
+
+def bench_detection_scale(args):
+    """Detection latency and IoU against full resolution for several detection_max_side values."""
+    from docscanner.geometry import quad_iou
+
+    folder = os.path.dirname(args.image) or '.'
+    paths = sorted(p for p in glob.glob(os.path.join(folder, '*')) if cv2.haveImageReader(p))
+    images = [cv2.imread(path) for path in paths]
+
+    reference = docscanner.createInstance(pool_size=1)
+    expected = [[result.quad for result in reference.detect(image)] for image in images]
+
+    print('{} images from {}'.format(len(images), folder))
+    print('max side   ms/image  mean IoU   min IoU  missed')
+    for max_side in (None, 1600, 1280, 960, 640, 480, 320):
+        scanner = docscanner.createInstance(pool_size=1, detection_max_side=max_side)
+        for image in images:
+            scanner.detect(image)
+
+        elapsed = timed(lambda: [scanner.detect(image) for image in images], args.iterations)
+        ious = []
+        missed = 0
+        for image, quads in zip(images, expected):
+            found = [result.quad for result in scanner.detect(image)]
+            for quad in quads:
+                best = max((quad_iou(quad, other) for other in found), default=0.0)
+                missed += best == 0.0
+                ious.append(best)
+
+        print('{:>8s}  {:9.2f}  {:8.3f}  {:8.3f}  {:6d}'.format(
+            'full' if max_side is None else str(max_side),
+            elapsed * 1000 / (args.iterations * len(images)),
+            float(np.mean(ious)) if ious else float('nan'),
+            min(ious) if ious else float('nan'),
+            missed))
+
+
+def replay_frames(args, count=200):
+    """Frames of args.video, or a synthetic handheld shot of args.image drifting over a textured background."""
+    if args.video:
+        capture = cv2.VideoCapture(args.video)
+        frames = []
+        while len(frames) < count:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            frames.append(frame)
+        capture.release()
+        return frames
+
+    document = cv2.imread(args.image)
+    height, width = document.shape[:2]
+    rng = np.random.default_rng(0)
+    background = cv2.GaussianBlur((rng.random((1080, 1920, 3)) * 60 + 40).astype(np.uint8), (9, 9), 3)
+    corners = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+    placed = np.float32([[700, 250], [1250, 280], [1230, 900], [680, 860]])
+    frames = []
+    for t in range(count):
+        drift = np.float32([40 * np.sin(t / 15), 25 * np.cos(t / 20)])
+        frame = background.copy()
+        cv2.warpPerspective(document, cv2.getPerspectiveTransform(corners, placed + drift), (1920, 1080),
+                            frame, borderMode=cv2.BORDER_TRANSPARENT)
+        frames.append(frame)
+    return frames
+
+
+def bench_tracking(args):
+    """CPU per frame and corner error against full detection when tracking between detections."""
+    from docscanner.geometry import corner_shifts, match_quads, stack_quads
+    from docscanner.tracking import QuadTracker
+
+    frames = replay_frames(args)
+    scanner = docscanner.createInstance(pool_size=1)
+    scanner.detect(frames[0])
+
+    start = time.process_time()
+    expected = [stack_quads(scanner.detect(frame)) for frame in frames]
+    full_ms = (time.process_time() - start) * 1000 / len(frames)
+
+    print('{} frames from {}'.format(len(frames), args.video or 'synthetic scene of ' + args.image))
+    print('interval  CPU ms/frame  detections  mean err px  max err px  lost')
+    print('{:>8s}  {:12.2f}  {:10d}  {:11.2f}  {:10.2f}  {:4d}'.format('full', full_ms, len(frames), 0, 0, 0))
+    for interval in (5, 10, 20, 40):
+        tracker = QuadTracker(redetect_interval=interval)
+        errors = []
+        start = time.process_time()
+        for frame, reference in zip(frames, expected):
+            track_frame = tracker.prepare(frame)
+            quads = tracker.track(track_frame)
+            if quads is None:
+                tracker.anchor(track_frame, stack_quads(scanner.detect(frame)))
+                continue
+            order = match_quads(quads, reference)
+            if order is not None and len(reference):
+                errors.extend(corner_shifts(quads[order], reference))
+        elapsed = time.process_time() - start
+
+        stats = tracker.stats()
+        print('{:8d}  {:12.2f}  {:10d}  {:11.2f}  {:10.2f}  {:4d}'.format(
+            interval, elapsed * 1000 / len(frames), stats['requested'],
+            float(np.mean(errors)) if errors else float('nan'),
+            float(np.max(errors)) if errors else float('nan'), stats['lost']))
+
+
+def bench_roi(args):
+    """Latency, searched pixels and corner error against full-frame search for several ROI margins."""
+    from docscanner.geometry import corner_shifts, match_quads, stack_quads
+
+    frames = replay_frames(args)
+    reference = docscanner.createInstance(pool_size=1)
+    expected = [stack_quads(reference.detect(frame)) for frame in frames]
+
+    print('{} frames from {}'.format(len(frames), args.video or 'synthetic scene of ' + args.image))
+    print('  margin  ms/frame  pixels  fallbacks  missed  mean err px')
+    for margin in (None, 0.5, 0.25, 0.15, 0.1):
+        scanner = docscanner.createInstance(pool_size=1, roi_margin=margin)
+        scanner.detect(frames[0])
+        if scanner.roi is not None:
+            scanner.roi.reset()
+
+        errors = []
+        missed = 0
+        start = time.perf_counter()
+        found = [stack_quads(scanner.detect(frame)) for frame in frames]
+        elapsed = time.perf_counter() - start
+        for quads, wanted in zip(found, expected):
+            order = match_quads(quads, wanted)
+            if order is None:
+                missed += 1
+            elif len(wanted):
+                errors.extend(corner_shifts(quads[order], wanted))
+
+        stats = scanner.roi.stats() if scanner.roi is not None else {'pixel_ratio': 1.0, 'fallbacks': 0}
+        print('{:>8s}  {:8.2f}  {:5.0f}%  {:9d}  {:6d}  {:11.2f}'.format(
+            'full' if margin is None else str(margin), elapsed * 1000 / len(frames),
+            stats['pixel_ratio'] * 100, stats['fallbacks'], missed,
+            float(np.mean(errors)) if errors else float('nan')))
+
+
+def bench_convert_mat(args):
+    """Cost of convertMat2ImageData for full frames, ROI views and bytes-backed arrays."""
+    frame = np.random.randint(0, 256, (1080, 1920, 3), dtype=np.uint8)
+    roi = frame[200:900, 300:1500]
+    backed = np.frombuffer(frame.tobytes(), dtype=np.uint8).reshape(frame.shape)
+
+    for name, mat in [('1080p frame', frame), ('ROI view', roi), ('bytes-backed', backed)]:
+        convertMat2ImageData(mat)
+        elapsed = timed(lambda: convertMat2ImageData(mat), args.iterations)
+        print('{:14s} {:8.2f} ms  {:8.1f} MB/s'.format(
+            name, elapsed * 1000 / args.iterations, mat.nbytes * args.iterations / elapsed / 1e6))
+
+
+def synthetic_image_data(pixel_format, width=2480, height=3508, align=32):
+    """Build an ImageData of an A4 page at 300 dpi, with rows padded to `align` bytes."""
+    bits_per_pixel = {
+        EnumImagePixelFormat.IPF_BINARY: 1,
+        EnumImagePixelFormat.IPF_BINARYINVERTED: 1,
+        EnumImagePixelFormat.IPF_GRAYSCALED: 8,
+        EnumImagePixelFormat.IPF_BINARY_8: 8,
+        EnumImagePixelFormat.IPF_BINARY_8_INVERTED: 8,
+        EnumImagePixelFormat.IPF_RGB_888: 24,
+        EnumImagePixelFormat.IPF_BGR_888: 24,
+        EnumImagePixelFormat.IPF_ARGB_8888: 32,
+        EnumImagePixelFormat.IPF_ABGR_8888: 32,
+    }[pixel_format]
+    stride = ((width * bits_per_pixel + 7) // 8 + align - 1) // align * align
+    data = np.random.randint(0, 256, stride * height, dtype=np.uint8).tobytes()
+    return ImageData(data, width, height, stride, pixel_format)
+
+
+PIXEL_FORMATS = [
+    ('BINARY', EnumImagePixelFormat.IPF_BINARY),
+    ('BINARYINVERTED', EnumImagePixelFormat.IPF_BINARYINVERTED),
+    ('GRAYSCALED', EnumImagePixelFormat.IPF_GRAYSCALED),
+    ('BINARY_8', EnumImagePixelFormat.IPF_BINARY_8),
+    ('BINARY_8_INVERTED', EnumImagePixelFormat.IPF_BINARY_8_INVERTED),
+    ('RGB_888', EnumImagePixelFormat.IPF_RGB_888),
+    ('BGR_888', EnumImagePixelFormat.IPF_BGR_888),
+    ('ARGB_8888', EnumImagePixelFormat.IPF_ARGB_8888),
+    ('ABGR_8888', EnumImagePixelFormat.IPF_ABGR_8888),
+]
+
+
+def bench_convert_normalized(args):
+    """convertNormalizedImage2Mat per pixel format on a padded A4 page, as view and as copy."""
+    print('format              view ms   copy ms')
+    for name, pixel_format in PIXEL_FORMATS:
+        image = synthetic_image_data(pixel_format)
+        view_ms = timed(lambda: convertNormalizedImage2Mat(image), args.iterations) * 1000 / args.iterations
+        copy_ms = timed(lambda: convertNormalizedImage2Mat(image, copy=True), args.iterations) * 1000 / args.iterations
+        print('{:18s} {:8.2f}  {:8.2f}'.format(name, view_ms, copy_ms))
+
+
+def legacy_convert_image_data(normalized_image):
+    """The per-bit loop formerly in examples/official/utils.convertImageData2Mat, kept as a baseline."""
+    ba = bytearray(normalized_image.get_bytes())
+    width = normalized_image.get_width()
+    height = normalized_image.get_height()
+    stride = normalized_image.get_stride()
+
+    channels = 3
+    if normalized_image.get_image_pixel_format() == EnumImagePixelFormat.IPF_BINARY:
+        channels = 1
+        all = []
+        skip = stride * 8 - width
+        index = 0
+        n = 1
+        for byte in ba:
+            byteCount = 7
+            while byteCount >= 0:
+                b = (byte & (1 << byteCount)) >> byteCount
+                if index < stride * 8 * n - skip:
+                    all.append(255 if b == 1 else 0)
+                byteCount -= 1
+                index += 1
+            if index == stride * 8 * n:
+                n += 1
+        return np.array(all, dtype=np.uint8).reshape(height, width, channels)
+
+    elif normalized_image.get_image_pixel_format() == EnumImagePixelFormat.IPF_GRAYSCALED:
+        channels = 1
+
+    return np.array(ba, dtype=np.uint8).reshape(height, width, channels)
+
+
+def bench_convert_formats(args):
+    """Shared vectorized conversion versus the legacy example loop, for every pixel format."""
+    # Unpadded rows, since the legacy code ignores the stride of byte formats.
+    legacy_iterations = min(args.iterations, 3)
+    print('format              legacy ms  shared ms   speedup')
+    for name, pixel_format in PIXEL_FORMATS:
+        image = synthetic_image_data(pixel_format, align=1)
+        shared_ms = timed(lambda: convertNormalizedImage2Mat(image, copy=True), args.iterations) * 1000 / args.iterations
+        try:
+            legacy_ms = timed(lambda: legacy_convert_image_data(image), legacy_iterations) * 1000 / legacy_iterations
+        except ValueError:
+            print('{:18s} {:>10s}  {:9.2f}  {:>8s}'.format(name, 'n/a', shared_ms, 'n/a'))
+            continue
+        print('{:18s} {:10.2f}  {:9.2f}  {:7.1f}x'.format(name, legacy_ms, shared_ms, legacy_ms / shared_ms))
+
+
+BENCHMARKS = {
+    'convert_formats': bench_convert_formats,
+    'convert_mat': bench_convert_mat,
+    'convert_normalized': bench_convert_normalized,
+    'detect_and_normalize': bench_detect_and_normalize,
+    'detection_scale': bench_detection_scale,
+    'normalize_many': bench_normalize_many,
+    'normalize_settings': bench_normalize_settings,
+    'parallel': bench_parallel,
+    'roi': bench_roi,
+    'router_pool': bench_router_pool,
+    'tracking': bench_tracking,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run docscanner benchmarks')
+    parser.add_argument('name', choices=sorted(BENCHMARKS), help='Benchmark to run')
+    parser.add_argument('--image', default='images/1.png', help='Path to the input image')
+    parser.add_argument('--video', help='Video replayed by the tracking and roi benchmarks')
+    parser.add_argument('--iterations', default=50, type=int,
+                        help='Iterations per measurement')
+    parser.add_argument('-l', '--license', default=DEFAULT_LICENSE,
+                        type=str, help='Set a valid license key')
+    args = parser.parse_args()
+
+    docscanner.initLicense(args.license)
+    BENCHMARKS[args.name](args)
+
+
+if __name__ == '__main__':
+    main()
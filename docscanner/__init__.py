@@ -57,6 +57,18 @@ Key Classes:
     - DocumentScanner: Main scanner class for detection and normalization
     - DocumentResult: Container for detection results and normalized images
     - FrameFetcher: Internal class for handling asynchronous image processing
+    - RouterPool: Pool of capture routers shared by concurrent callers
+    - SourceCache: Byte-bounded LRU cache of decoded file sources
+    - LatestDispatcher: Off-thread, latest-result-wins delivery to async listeners
+    - AsyncDocumentScanner (docscanner.aio): awaitable API for asyncio services
+
+Batch processing:
+    ```python
+    for index, results in scanner.detect_batch(paths, ordered=True):
+        if isinstance(results, Exception):
+            continue
+        ...
+    ```
 
 Key Functions:
     - initLicense(): Initialize SDK license (required before use)
@@ -77,26 +89,204 @@ from dynamsoft_capture_vision_bundle import (
     CaptureVisionRouter,
     LicenseManager,
     ImageData,
+    ImageIO,
     ImageSourceAdapter,
     CapturedResultReceiver,
     DocumentNormalizerModule,
     Quadrilateral,
     EnumImageColourMode,
+    EnumBufferOverflowProtectionMode,
+    EnumVideoFrameQuality,
+    VideoFrameTag,
     Point
 )
-from typing import List, Tuple, Callable, Union, Optional, Any
+from typing import List, Tuple, Callable, Union, Optional, Any, Iterable, Iterator, Dict, NamedTuple
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from collections import deque, OrderedDict
+import threading
+import time
 import numpy as np
+import cv2
+
+from .pool import RouterPool, default_pool_size
+from .cache import SourceCache
+from .dispatch import ChangeFilter, LatestDispatcher
+from .geometry import stack_quads
+from .instrument import Instrumentation, StageHook
+from .roi import RoiSearch
+from .tracking import QuadTracker, TrackFrame
+from .convert import convertMat2ImageData, convertNormalizedImage2Mat, _PACKED_PIXEL_CHANNELS
 
 __version__ = DocumentNormalizerModule.get_version()
+
+
+class CaptureError(Exception):
+    """
+    Raised when the SDK reports an error for a capture.
+
+    Attributes:
+        error_code (int): The SDK error code.
+        error_string (str): The SDK error message.
+    """
+
+    def __init__(self, error_code: int, error_string: str) -> None:
+        super().__init__(error_code, error_string)
+        self.error_code: int = error_code
+        self.error_string: str = error_string
+
+    def __str__(self) -> str:
+        return f"{self.error_code} {self.error_string}"
+
+
+def _iter_windowed(submit: Callable[[Any], Future], inputs: Iterable[Any], max_in_flight: int,
+                   ordered: bool) -> Iterator[Tuple[int, Future]]:
+    """
+    Submit inputs with at most max_in_flight outstanding and yield finished futures.
+
+    Args:
+        submit (callable): Schedules one input and returns its Future.
+        inputs (Iterable): The inputs, consumed lazily.
+        max_in_flight (int): Maximum number of submitted but unyielded inputs.
+        ordered (bool): Yield in input order instead of completion order.
+
+    Yields:
+        Tuple[int, Future]: The input index and its completed future.
+    """
+    pending: "deque[Tuple[int, Future]]" = deque()
+    items = enumerate(inputs)
+    exhausted = False
+
+    while True:
+        while not exhausted and len(pending) < max_in_flight:
+            try:
+                index, input = next(items)
+            except StopIteration:
+                exhausted = True
+                break
+            pending.append((index, submit(input)))
+
+        if not pending:
+            return
+
+        if ordered:
+            index, future = pending.popleft()
+            wait([future])
+            yield index, future
+        else:
+            wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+            still_pending: "deque[Tuple[int, Future]]" = deque()
+            for index, future in pending:
+                if future.done():
+                    yield index, future
+                else:
+                    still_pending.append((index, future))
+            pending = still_pending
+
     
+class _Frame(NamedTuple):
+    """Bookkeeping for one frame in FrameFetcher: id, enqueue time, tag, detection scale, tracking frame and ROI offset."""
+    frame_id: Optional[int]
+    enqueued_at: float
+    tag: Optional[VideoFrameTag]
+    scale: Optional[np.ndarray]
+    track_frame: Optional[TrackFrame] = None
+    offset: Optional[np.ndarray] = None
+
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+
+DISPATCH_INLINE = "inline"
+DISPATCH_LATEST = "latest"
+
+
 class FrameFetcher(ImageSourceAdapter):
     """
     Custom image source adapter for handling frame-by-frame image processing.
     
     This class extends ImageSourceAdapter to provide continuous image fetching
     capability for real-time document detection scenarios like camera streams.
+
+    The frame buffer can be bounded, so that a camera faster than detection
+    does not build up latency and memory. Every frame is tagged with an
+    increasing frame id and its enqueue time, which lets stale frames be
+    dropped and results be matched back to their frames.
+
+    Attributes:
+        max_depth (int or None): Maximum number of frames waiting in the buffer.
+                                 None leaves the buffer unbounded.
+        overflow (str): What add_frame() does when the buffer is full:
+                        DROP_OLDEST evicts the oldest waiting frame,
+                        DROP_NEWEST discards the incoming frame, and BLOCK
+                        waits for room.
+        max_age (float or None): Frames older than this many seconds are
+                                 dropped instead of being delivered.
+        history (int): Number of recently accepted frames kept for frame().
+        enqueued (int): Frames accepted into the buffer.
+        dropped (int): Frames discarded by the overflow policy or max_age.
+        processed (int): Frames whose results were delivered to the listener.
     """
-    
+
+    def __init__(self, max_depth: Optional[int] = None, overflow: str = DROP_OLDEST,
+                 max_age: Optional[float] = None, history: int = 0) -> None:
+        """
+        Initialize the frame buffer.
+
+        Args:
+            max_depth (int, optional): Maximum number of waiting frames. None
+                                       (the default) keeps every frame.
+            overflow (str): DROP_OLDEST (the default), DROP_NEWEST or BLOCK.
+            max_age (float, optional): Maximum frame age in seconds.
+            history (int): Number of recently accepted full-resolution frames
+                           kept in a ring buffer keyed by frame id. 0 keeps none.
+        """
+        super().__init__()
+        self.history: int = history
+        self._history: "OrderedDict[int, Any]" = OrderedDict()
+        self.enqueued: int = 0
+        self.dropped: int = 0
+        self.processed: int = 0
+        self._next_id: int = 0
+        # Frames that left the SDK buffer when a newer frame was added with
+        # DROP_OLDEST, keyed to the id of that newer frame. Each was either
+        # evicted or fetched just before; see _settle_evictions().
+        self._evicting: Dict[int, int] = {}
+        # Every frame whose result has not arrived yet, oldest first. The SDK
+        # keeps only a pointer to the tag, so it is held here.
+        self._pending: "OrderedDict[int, _Frame]" = OrderedDict()
+        self._condition = threading.Condition()
+        self.configure(max_depth, overflow, max_age)
+
+    def configure(self, max_depth: Optional[int] = None, overflow: str = DROP_OLDEST,
+                  max_age: Optional[float] = None) -> None:
+        """
+        Change the buffer bound, overflow policy and maximum frame age.
+
+        Args:
+            max_depth (int, optional): Maximum number of waiting frames, or None.
+            overflow (str): DROP_OLDEST, DROP_NEWEST or BLOCK.
+            max_age (float, optional): Maximum frame age in seconds, or None.
+
+        Raises:
+            ValueError: If max_depth is less than 1 or overflow is unknown.
+        """
+        if max_depth is not None and max_depth < 1:
+            raise ValueError("Frame buffer depth must be at least 1")
+        if overflow not in (DROP_OLDEST, DROP_NEWEST, BLOCK):
+            raise ValueError("Unknown overflow policy: {}".format(overflow))
+
+        self.max_depth: Optional[int] = max_depth
+        self.overflow: str = overflow
+        self.max_age: Optional[float] = max_age
+        if max_depth is not None:
+            # The SDK buffer enforces the bound too: with BOPM_UPDATE it evicts
+            # the oldest frame itself, otherwise it refuses new ones.
+            self.set_max_image_count(max_depth)
+            self.set_buffer_overflow_protection_mode(
+                EnumBufferOverflowProtectionMode.BOPM_UPDATE if overflow == DROP_OLDEST
+                else EnumBufferOverflowProtectionMode.BOPM_BLOCK)
+
     def has_next_image_to_fetch(self) -> bool:
         """
         Indicates whether there are more images to fetch.
@@ -106,15 +296,214 @@ class FrameFetcher(ImageSourceAdapter):
         """
         return True
 
-    def add_frame(self, imageData: ImageData) -> None:
+    def add_frame(self, imageData: ImageData, timeout: Optional[float] = None,
+                  scale: Optional[np.ndarray] = None, source: Any = None,
+                  track_frame: Optional[TrackFrame] = None, offset: Optional[np.ndarray] = None) -> bool:
         """
         Adds a new image frame to the processing buffer.
         
         Args:
             imageData (ImageData): The image data to be added to the buffer
                                   for document detection processing.
+            timeout (float, optional): With the BLOCK policy, seconds to wait
+                                       for room. None waits forever.
+            scale (numpy.ndarray, optional): (x, y) factors mapping coordinates
+                                             in a downscaled frame back to the
+                                             original frame.
+            source (optional): The full-resolution frame to keep in the history
+                               ring. Defaults to imageData.
+            track_frame (TrackFrame, optional): The frame's tracking copy, handed
+                                                back with its result so the
+                                                tracker can restart from it.
+            offset (numpy.ndarray, optional): (x, y) position of imageData in the
+                                              full frame when it is a search region.
+
+        Returns:
+            bool: True if the frame was queued, False if it was dropped.
+        """
+        with self._condition:
+            now = time.monotonic()
+            self._drop_stale(now)
+            oldest: List[int] = []
+
+            if self.max_depth is not None:
+                waiting = self.get_image_count()
+                if waiting >= self.max_depth and self.overflow == BLOCK:
+                    deadline = None if timeout is None else now + timeout
+                    while waiting >= self.max_depth:
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            self.dropped += 1
+                            return False
+                        # Results notify; the short poll covers frames that the
+                        # router fetched but has not reported yet.
+                        self._condition.wait(0.005 if remaining is None else min(remaining, 0.005))
+                        waiting = self.get_image_count()
+                elif waiting >= self.max_depth and self.overflow == DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                elif waiting >= self.max_depth:
+                    # The SDK evicts the oldest waiting frame when this one is
+                    # added, unless its fetch thread takes a frame first.
+                    oldest = self._waiting_ids()[:1]
+
+            frame_id = self._next_id
+            self._next_id += 1
+            tag = VideoFrameTag(EnumVideoFrameQuality.VFQ_UNKNOWN, False, None,
+                                imageData.get_width(), imageData.get_height())
+            tag.set_image_id(frame_id)
+            imageData.set_image_tag(tag)
+            self.add_image_to_buffer(imageData)
+            self._pending[frame_id] = _Frame(frame_id, now, tag, scale, track_frame, offset)
+            if oldest and not self.has_image(oldest[0]):
+                # Evicted, or fetched in the meantime: it stays pending until
+                # a result tells which.
+                self._evicting[oldest[0]] = frame_id
+            self.enqueued += 1
+            self._remember(frame_id, imageData if source is None else source)
+            return True
+
+    def remember(self, source: Any) -> int:
+        """
+        Give a frame that is not queued for detection an id and keep it in the history ring.
+
+        Args:
+            source: The full-resolution frame.
+
+        Returns:
+            int: The frame id.
+        """
+        with self._condition:
+            frame_id = self._next_id
+            self._next_id += 1
+            self._remember(frame_id, source)
+            return frame_id
+
+    def frame(self, frame_id: int) -> Any:
+        """
+        Return a recently queued frame from the history ring.
+
+        Args:
+            frame_id (int): The id carried by DocumentResult.frame_id.
+
+        Returns:
+            ImageData, numpy.ndarray or None: The full-resolution frame, or None
+            if it has already left the ring.
+        """
+        with self._condition:
+            return self._history.get(frame_id)
+
+    def frame_done(self, result: Any) -> Optional[_Frame]:
+        """
+        Account for a captured result and decide whether to deliver it.
+
+        Args:
+            result (CapturedResult): A result captured from a buffered frame.
+
+        Returns:
+            The frame's bookkeeping record, or None if its result should be
+            discarded: the frame is older than max_age, or it is unknown, for
+            example because clear() forgot it, so its scale and offset are lost.
+        """
+        tag = result.get_original_image_tag()
+        with self._condition:
+            frame_id = tag.get_image_id() if tag is not None else None
+            frame = self._pending.pop(frame_id, None) if frame_id is not None else None
+            if frame_id is not None:
+                self._settle_evictions(frame_id)
+            self._condition.notify_all()
+            if frame is None:
+                return None
+            if self.max_age is not None and time.monotonic() - frame.enqueued_at > self.max_age:
+                self.dropped += 1
+                return None
+            self.processed += 1
+            return frame
+
+    def clear(self) -> None:
+        """Drop every waiting frame and forget frames without a result, counting them as dropped."""
+        with self._condition:
+            self.clear_buffer()
+            self._forget(list(self._pending))
+            self._evicting.clear()
+            self._condition.notify_all()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every accepted frame has been delivered or dropped.
+
+        Args:
+            timeout (float, optional): Seconds to wait. None waits until then.
+
+        Returns:
+            bool: True if no frame is pending, False if the timeout expired first.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the frame counters.
+
+        Every accepted frame ends up counted once, in dropped or processed.
+        Frames refused by DROP_NEWEST or a BLOCK timeout count as dropped
+        without being enqueued.
+
+        Returns:
+            dict: enqueued, dropped, processed, buffered and max_depth.
+        """
+        with self._condition:
+            return {
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "processed": self.processed,
+                "buffered": self.get_image_count(),
+                "max_depth": self.max_depth,
+            }
+
+    def _drop_stale(self, now: float) -> None:
+        """Clear the buffer once every waiting frame is older than max_age."""
+        if self.max_age is None:
+            return
+        waiting = self._waiting_ids()
+        # The SDK hands out the newest waiting frame first, so while a fresh
+        # frame is waiting the stale ones are never reached before it; their
+        # results, if any, are discarded by frame_done().
+        if waiting and now - self._pending[waiting[-1]].enqueued_at > self.max_age:
+            self.clear_buffer()
+            self._forget(waiting)
+
+    def _remember(self, frame_id: int, source: Any) -> None:
+        """Add a frame to the history ring, evicting the oldest beyond its size."""
+        if self.history > 0:
+            self._history[frame_id] = source
+            while len(self._history) > self.history:
+                self._history.popitem(last=False)
+
+    def _waiting_ids(self) -> List[int]:
+        """Return the ids of the frames still in the SDK buffer, oldest first."""
+        return [frame_id for frame_id in self._pending if self.has_image(frame_id)]
+
+    def _settle_evictions(self, frame_id: int) -> None:
+        """
+        Resolve possibly evicted frames once the result of frame_id has arrived.
+
+        Frames are captured one at a time in fetch order. A possibly evicted
+        frame that was really fetched was fetched before the frame whose
+        addition pushed it out, so its result comes first. Once the result of
+        that frame or of any later one arrives, it is known to be evicted.
         """
-        self.add_image_to_buffer(imageData)
+        self._evicting.pop(frame_id, None)
+        evicted = [evicting_id for evicting_id, added_id in self._evicting.items() if added_id <= frame_id]
+        for evicting_id in evicted:
+            del self._evicting[evicting_id]
+        self._forget(evicted)
+
+    def _forget(self, frame_ids: List[int]) -> None:
+        """Stop tracking the given frames and count them as dropped."""
+        for frame_id in frame_ids:
+            del self._pending[frame_id]
+            self.dropped += 1
 
 
 class MyCapturedResultReceiver(CapturedResultReceiver):
@@ -125,7 +514,9 @@ class MyCapturedResultReceiver(CapturedResultReceiver):
     to DocumentResult objects before passing to the user-defined listener.
     """
 
-    def __init__(self, listener: Callable[[List['DocumentResult']], None]) -> None:
+    def __init__(self, listener: Callable[[List['DocumentResult']], None],
+                 fetcher: Optional[FrameFetcher] = None, normalize: bool = True,
+                 tracker: Optional[QuadTracker] = None, roi: Optional[RoiSearch] = None) -> None:
         """
         Initialize the result receiver with a callback listener.
         
@@ -133,47 +524,103 @@ class MyCapturedResultReceiver(CapturedResultReceiver):
             listener (callable): A callback function that will be called
                                with a list of DocumentResult objects when
                                documents are detected.
+            fetcher (FrameFetcher, optional): The frame source, which counts
+                                              results and filters out stale ones.
+            normalize (bool): True if results come from PT_DETECT_AND_NORMALIZE_DOCUMENT,
+                              False for the detect-only template.
+            tracker (QuadTracker, optional): Restarted from every detection
+                                             result of a frame it prepared.
+            roi (RoiSearch, optional): Told where documents were found, to
+                                       place the next search region.
         """
         super().__init__()
         self.listener = listener
+        self.fetcher = fetcher
+        self.normalize = normalize
+        self.tracker = tracker
+        self.roi = roi
     
     def on_captured_result_received(self, result: Any) -> None:
-        output: List['DocumentResult'] = []
-        processed_document_result = result.get_processed_document_result()
-        if processed_document_result is None or len(processed_document_result.get_deskewed_image_result_items()) == 0:
-            pass
-        else:
-            items = processed_document_result.get_deskewed_image_result_items()
-            for index, item in enumerate(processed_document_result.get_deskewed_image_result_items()):
-            
-                image = item.get_image_data()
-                if image is not None:
+        frame = None
+        if self.fetcher is not None:
+            frame = self.fetcher.frame_done(result)
+            if frame is None:
+                return
+        documents = _deskewed_documents(result) if self.normalize else _detected_documents(result)
+        if frame is not None:
+            for document in documents:
+                if frame.scale is not None:
+                    document.quad *= frame.scale
+                if frame.offset is not None:
+                    document.quad += frame.offset
+                document.frame_id = frame.frame_id
+            if self.tracker is not None and frame.track_frame is not None:
+                self.tracker.anchor(frame.track_frame, stack_quads(documents))
+            if self.roi is not None and frame.frame_id is not None:
+                self.roi.update(stack_quads(documents), frame.offset is not None)
+        self.listener(documents)
+
+
+def _deskewed_documents(result: Any) -> List['DocumentResult']:
+    """
+    Build DocumentResult objects from the deskewed image items of a captured result.
+
+    Args:
+        result (CapturedResult): A result captured with PT_DETECT_AND_NORMALIZE_DOCUMENT.
+
+    Returns:
+        List[DocumentResult]: One result per deskewed image, carrying the source
+                              quad and the normalized image. The image is
+                              converted to numpy on first access.
+    """
+    output: List['DocumentResult'] = []
+    processed_document_result = result.get_processed_document_result()
+    if processed_document_result is None:
+        return output
+
+    for item in processed_document_result.get_deskewed_image_result_items():
+        if item.get_image_data() is not None:
+            document = DocumentResult(quad=_quad_array(item.get_source_deskew_quad()))
+            document._deskewed_item = item
+            output.append(document)
+
+    return output
+
+
+def _detected_documents(result: Any) -> List['DocumentResult']:
+    """
+    Build DocumentResult objects from the detected quad items of a captured result.
+
+    Args:
+        result (CapturedResult): A result captured with PT_DETECT_DOCUMENT_BOUNDARIES.
+
+    Returns:
+        List[DocumentResult]: One result per detected quad, without a normalized image.
+    """
+    processed_document_result = result.get_processed_document_result()
+    if processed_document_result is None:
+        return []
+    return [DocumentResult(item) for item in processed_document_result.get_detected_quad_result_items()]
+
+
+def _quad_array(location: Quadrilateral) -> np.ndarray:
+    """Copy the four corners of an SDK Quadrilateral into a (4, 2) float32 array."""
+    points = location.points
+    return np.array([(points[0].x, points[0].y), (points[1].x, points[1].y),
+                     (points[2].x, points[2].y), (points[3].x, points[3].y)], dtype=np.float32)
+
+
+def _corner_property(row: int, column: int, doc: str) -> property:
+    """Build a property exposing one coordinate of DocumentResult.quad as an int."""
+
+    def getter(self: 'DocumentResult') -> int:
+        return int(round(float(self.quad[row, column])))
+
+    def setter(self: 'DocumentResult', value: float) -> None:
+        self.quad[row, column] = value
+
+    return property(getter, setter, doc=doc)
 
-                    mat = convertNormalizedImage2Mat(image)
-
-                    location = item.get_source_deskew_quad()
-                    x1 = location.points[0].x
-                    y1 = location.points[0].y
-                    x2 = location.points[1].x
-                    y2 = location.points[1].y
-                    x3 = location.points[2].x
-                    y3 = location.points[2].y
-                    x4 = location.points[3].x
-                    y4 = location.points[3].y
-
-                    document = DocumentResult()
-                    document.x1 = x1
-                    document.y1 = y1
-                    document.x2 = x2
-                    document.y2 = y2
-                    document.x3 = x3
-                    document.y3 = y3
-                    document.x4 = x4
-                    document.y4 = y4
-                    document.normalized_image = mat
-                    output.append(document)
-
-        self.listener(output)
 
 class DocumentResult:
     """
@@ -182,47 +629,86 @@ class DocumentResult:
     This class contains the detection results for a single document, including
     the four corner points of the detected document boundary and optionally
     the normalized (perspective-corrected) image.
+
+    The corners are stored in one (4, 2) float32 array, and the class uses
+    __slots__, which keeps millions of results cheap to hold. Use
+    docscanner.geometry.stack_quads() to turn a list of results into a single
+    (N, 4, 2) array.
     
     Attributes:
+        quad (numpy.ndarray): (4, 2) float32 corners in the order top-left,
+                              top-right, bottom-right, bottom-left
         x1, y1 (int): Top-left corner coordinates
         x2, y2 (int): Top-right corner coordinates  
         x3, y3 (int): Bottom-right corner coordinates
         x4, y4 (int): Bottom-left corner coordinates
         source (str or numpy.ndarray, optional): Original source image
         normalized_image (numpy.ndarray, optional): Perspective-corrected document image
+        frame_id (int, optional): Id of the detectMatAsync() frame the result
+                                  came from, used by normalize() to find the
+                                  frame in the scanner's frame history
+        tracked (bool): True if the quad was carried over from an earlier
+                        detection by the optical-flow tracker, False if it
+                        was detected in this frame
+
+    Note:
+        x1..y4 are properties over quad, rounded to int on read; quad keeps
+        any sub-pixel precision.
+
+        Results delivered by the async listener keep the SDK's deskewed image
+        and convert it to numpy only when normalized_image is first read, so
+        frames nobody looks at cost no conversion.
     """
+
+    __slots__ = ('quad', 'source', 'frame_id', 'tracked', '_normalized_image', '_deskewed_item')
+
+    x1 = _corner_property(0, 0, "Top-left x coordinate")
+    y1 = _corner_property(0, 1, "Top-left y coordinate")
+    x2 = _corner_property(1, 0, "Top-right x coordinate")
+    y2 = _corner_property(1, 1, "Top-right y coordinate")
+    x3 = _corner_property(2, 0, "Bottom-right x coordinate")
+    y3 = _corner_property(2, 1, "Bottom-right y coordinate")
+    x4 = _corner_property(3, 0, "Bottom-left x coordinate")
+    y4 = _corner_property(3, 1, "Bottom-left y coordinate")
     
-    def __init__(self, item: Optional[Any] = None) -> None:
+    def __init__(self, item: Optional[Any] = None, quad: Optional[np.ndarray] = None) -> None:
         """
         Initialize a DocumentResult from an SDK document item.
         
         Args:
             item (optional): The document item from the SDK containing detection results.
                            If None, creates an empty DocumentResult instance.
+            quad (numpy.ndarray, optional): Corners as a (4, 2) array, used when
+                                           item is None.
         """
 
         if item is not None:
-            location = item.get_location()
-            x1 = location.points[0].x
-            y1 = location.points[0].y
-            x2 = location.points[1].x
-            y2 = location.points[1].y
-            x3 = location.points[2].x
-            y3 = location.points[2].y
-            x4 = location.points[3].x
-            y4 = location.points[3].y
-
-            self.x1: int = x1
-            self.y1: int = y1
-            self.x2: int = x2
-            self.y2: int = y2
-            self.x3: int = x3
-            self.y3: int = y3
-            self.x4: int = x4
-            self.y4: int = y4
+            self.quad: np.ndarray = _quad_array(item.get_location())
+        elif quad is not None:
+            self.quad = np.array(quad, dtype=np.float32).reshape(4, 2)
+        else:
+            self.quad = np.zeros((4, 2), dtype=np.float32)
 
         self.source: Optional[Union[str, np.ndarray]] = None
-        self.normalized_image: Optional[np.ndarray] = None
+        self.frame_id: Optional[int] = None
+        self.tracked: bool = False
+        self._normalized_image: Optional[np.ndarray] = None
+        # The SDK result item holding a not yet converted normalized image. The
+        # item, not just its ImageData, is kept so the native image stays alive.
+        self._deskewed_item: Optional[Any] = None
+
+    @property
+    def normalized_image(self) -> Optional[np.ndarray]:
+        """Perspective-corrected document image, converted from the SDK on first access."""
+        if self._deskewed_item is not None:
+            self._normalized_image = convertNormalizedImage2Mat(self._deskewed_item.get_image_data())
+            self._deskewed_item = None
+        return self._normalized_image
+
+    @normalized_image.setter
+    def normalized_image(self, value: Optional[np.ndarray]) -> None:
+        self._normalized_image = value
+        self._deskewed_item = None
 
 class DocumentScanner:
     """
@@ -250,17 +736,138 @@ class DocumentScanner:
         # Process results  
         for result in results:
             print(f"Document found at: ({result.x1},{result.y1}) to ({result.x3},{result.y3})")
+
+    Thread Safety:
+        detect() and normalize() check a router out of an internal RouterPool
+        for the duration of each call, so one scanner can be shared by a
+        thread pool. The async listener path uses its own dedicated router.
     """
     
-    def __init__(self) -> None:
-        """Initialize the DocumentScanner with default settings."""
+    def __init__(self, pool_size: Optional[int] = None, cache_bytes: int = 0,
+                 frame_buffer_size: Optional[int] = None, frame_overflow: str = DROP_OLDEST,
+                 max_frame_age: Optional[float] = None, detection_max_side: Optional[int] = None,
+                 frame_history: int = 0, roi_margin: Optional[float] = None,
+                 roi_max_misses: int = 3, instrument: bool = False) -> None:
+        """
+        Initialize the DocumentScanner with default settings.
+
+        Args:
+            pool_size (int, optional): Maximum number of routers used by concurrent
+                                       detect()/normalize() calls. Defaults to the
+                                       number of CPU cores. Routers are created on
+                                       first use, so a single-threaded caller only
+                                       ever builds one.
+            cache_bytes (int): Size in bytes of the decoded-image cache shared by
+                               detect() and normalize() for file path sources.
+                               0 (the default) disables the cache.
+            frame_buffer_size (int, optional): Maximum number of frames queued by
+                                               detectMatAsync(). None (the default)
+                                               keeps every frame.
+            frame_overflow (str): Policy when the frame buffer is full:
+                                  DROP_OLDEST (the default), DROP_NEWEST or BLOCK.
+            max_frame_age (float, optional): Frames older than this many seconds
+                                             are dropped instead of delivered.
+            detection_max_side (int, optional): If set, boundary detection runs on
+                                                a copy shrunk so that its longer side
+                                                is at most this many pixels. Returned
+                                                coordinates are mapped back to full
+                                                resolution, and normalization still
+                                                uses the full-resolution source.
+            frame_history (int): Number of recent detectMatAsync() frames kept at
+                                 full resolution, so that normalize() can warp an
+                                 async result after the fact. 0 (the default)
+                                 keeps none.
+            roi_margin (float, optional): If set, detect() on arrays and
+                                          detectMatAsync() search only the
+                                          bounding box of the last documents
+                                          found, grown by this fraction of its
+                                          size on each side. None (the default)
+                                          always searches the whole frame.
+            roi_max_misses (int): Region searches that find nothing before the
+                                  whole frame is searched again.
+            instrument (bool): Time each stage of detect() and normalize() and
+                               report it in stats(). False (the default)
+                               measures nothing.
+        """
         cvr_instance = CaptureVisionRouter()
-        self.fetcher: FrameFetcher = FrameFetcher()
+        self.fetcher: FrameFetcher = FrameFetcher(frame_buffer_size, frame_overflow, max_frame_age, frame_history)
         cvr_instance.set_input(self.fetcher)
         self.cvr_instance: CaptureVisionRouter = cvr_instance
         self.receiver: Optional[MyCapturedResultReceiver] = None
+        self.dispatcher: Optional[LatestDispatcher] = None
+        self.change_filter: Optional[ChangeFilter] = None
+        self.tracker: Optional[QuadTracker] = None
+        self.roi: Optional[RoiSearch] = None if roi_margin is None else RoiSearch(roi_margin, roi_max_misses)
+        self.pool: RouterPool = RouterPool(pool_size)
+        self.cache: Optional[SourceCache] = SourceCache(cache_bytes) if cache_bytes > 0 else None
+        self.detection_max_side: Optional[int] = detection_max_side
+        self.instrumentation: Optional[Instrumentation] = Instrumentation() if instrument else None
+        # Per-router template state, keyed by id(router): pre-built simplified
+        # settings per (template, colour mode) with the template's own ROI, and
+        # what was last pushed.
+        self._template_settings: Dict[Tuple[int, str, int], Tuple[Any, Any, int]] = {}
+        self._pushed_settings: Dict[Tuple[int, str], Any] = {}
+
+    def _update_template(self, cvr: CaptureVisionRouter, template: str, colour_mode: EnumImageColourMode,
+                         points: Optional[Tuple[Tuple[int, int], ...]] = None) -> Tuple[int, str]:
+        """
+        Push colour mode and optional ROI settings into one of a router's templates.
+
+        The simplified settings object for each (router, template, colour mode)
+        is fetched from the SDK once and reused. update_settings() is skipped
+        entirely when the router already holds the requested configuration.
+
+        Args:
+            cvr (CaptureVisionRouter): A router checked out of the pool.
+            template (str): The preset template to configure.
+            colour_mode (EnumImageColourMode): Color mode for normalized output.
+            points (tuple, optional): Four (x, y) ROI corners in pixels.
+
+        Returns:
+            tuple: (error_code, error_message) from update_settings().
+        """
+        router_id = id(cvr)
+        pushed = (colour_mode, points)
+        if self._pushed_settings.get((router_id, template)) == pushed:
+            return EnumErrorCode.EC_OK, ""
+
+        entry = self._template_settings.get((router_id, template, colour_mode))
+        if entry is None:
+            error_code, error_message, settings = cvr.get_simplified_settings(template)
+            if error_code != EnumErrorCode.EC_OK:
+                return error_code, error_message
+            settings.document_settings.colour_mode = colour_mode
+            # settings.roi is a reference into the settings, so keep the
+            # template's default corners as values.
+            entry = (settings, tuple((point.x, point.y) for point in settings.roi.points),
+                     settings.roi_measured_in_percentage)
+            self._template_settings[(router_id, template, colour_mode)] = entry
+        settings, default_points, default_in_percentage = entry
+
+        # Pixel units apply only to an explicit ROI. Without one the template's
+        # default, the whole image in percent, is kept.
+        quad = Quadrilateral()
+        if points is None:
+            quad.points = [Point(x, y) for x, y in default_points]
+            settings.roi_measured_in_percentage = default_in_percentage
+        else:
+            quad.points = [Point(x, y) for x, y in points]
+            settings.roi_measured_in_percentage = 0
+        settings.roi = quad
+
+        error_code, error_message = cvr.update_settings(template, settings)
+        if error_code == EnumErrorCode.EC_OK:
+            self._pushed_settings[(router_id, template)] = pushed
+        else:
+            self._pushed_settings.pop((router_id, template), None)
+        return error_code, error_message
     
-    def addAsyncListener(self, listener: Callable[[List[DocumentResult]], None]) -> None:
+    def addAsyncListener(self, listener: Callable[[List[DocumentResult]], None],
+                         frame_buffer_size: Optional[int] = None, frame_overflow: Optional[str] = None,
+                         max_frame_age: Optional[float] = None, normalize: bool = True,
+                         dispatch: str = DISPATCH_INLINE, min_change: Optional[float] = None,
+                         min_iou: Optional[float] = None,
+                         redetect_interval: Optional[int] = None) -> bool:
         """
         Start asynchronous document detection with a callback listener.
 
@@ -270,7 +877,56 @@ class DocumentScanner:
         Args:
             listener (callable): Function to call with detected documents.
                                Receives a list of DocumentResult objects.
+            frame_buffer_size (int, optional): Override the scanner's frame buffer depth.
+            frame_overflow (str, optional): Override the scanner's overflow policy.
+            max_frame_age (float, optional): Override the scanner's maximum frame age.
+            normalize (bool): If True (the default), frames are captured with
+                              PT_DETECT_AND_NORMALIZE_DOCUMENT and results carry
+                              normalized_image. If False, the detect-only
+                              PT_DETECT_DOCUMENT_BOUNDARIES template is used and
+                              no per-frame warp is done.
+            dispatch (str): DISPATCH_INLINE (the default) calls the listener on
+                            the SDK's callback thread. DISPATCH_LATEST calls it
+                            on a separate thread through a single-slot mailbox:
+                            while the listener is busy, newer results replace
+                            the waiting one, so a slow listener never stalls
+                            capture or falls behind.
+            min_change (float, optional): If set, only call the listener when
+                                          a document corner moved by at least
+                                          this many pixels since the last call,
+                                          or when documents appear or disappear.
+            min_iou (float, optional): If set, only call the listener when the
+                                       IoU between a document and its last
+                                       delivered position falls below this
+                                       value. Combined with min_change, both
+                                       conditions must hold.
+            redetect_interval (int, optional): If set, detectMatAsync() tracks
+                                               the last detected documents with
+                                               optical flow and runs a full
+                                               detection only every this many
+                                               frames, or when tracking is lost.
+
+        Returns:
+            bool: True if capturing started. SDK errors are printed, and the
+                  scanner is left without a listener.
+
+        Raises:
+            ValueError: If dispatch is unknown.
         
+        Note:
+            A listener added earlier is removed first, as by clearAsyncListener().
+
+            Frame counters are available from scanner.fetcher.stats(), and with
+            DISPATCH_LATEST the delivered and coalesced counts from
+            scanner.dispatcher.stats(). With min_change or min_iou, the delivered and
+            suppressed counts are in scanner.change_filter.stats().
+
+            With redetect_interval, results of tracked frames have tracked set
+            to True and no normalized_image, and they are passed to the listener
+            on the thread calling detectMatAsync(). Set frame_history to be able
+            to normalize() them. The tracker is scanner.tracker, whose settings
+            can be changed and whose counters are in scanner.tracker.stats().
+
         Example:
             def on_document_detected(documents):
                 for document in documents:
@@ -278,9 +934,48 @@ class DocumentScanner:
 
             reader.addAsyncListener(on_document_detected)
         """
-        self.receiver = MyCapturedResultReceiver(listener)
+        if dispatch not in (DISPATCH_INLINE, DISPATCH_LATEST):
+            raise ValueError("Unknown dispatch mode: {}".format(dispatch))
+        if self.receiver is not None:
+            # Replace the running listener instead of registering a second one.
+            self.clearAsyncListener()
+        fetcher = self.fetcher
+        if frame_buffer_size is not None or frame_overflow is not None or max_frame_age is not None:
+            fetcher.configure(fetcher.max_depth if frame_buffer_size is None else frame_buffer_size,
+                              fetcher.overflow if frame_overflow is None else frame_overflow,
+                              fetcher.max_age if max_frame_age is None else max_frame_age)
+        if dispatch == DISPATCH_LATEST:
+            self.dispatcher = LatestDispatcher(listener)
+            listener = self.dispatcher.submit
+        self.change_filter = None
+        if min_change is not None or min_iou is not None:
+            # Filter before dispatching, so suppressed results never reach the
+            # mailbox. Without min_change any corner movement counts, so min_iou
+            # alone decides.
+            self.change_filter = ChangeFilter(listener, 0.0 if min_change is None else min_change, min_iou)
+            listener = self.change_filter
+        self.tracker = None if redetect_interval is None else QuadTracker(redetect_interval)
+        error_code, error_message = self._start_listener(listener, normalize)
+        if error_code != EnumErrorCode.EC_OK:
+            print("Error:", error_code, error_message)
+            self.clearAsyncListener()
+            self.change_filter = None
+            return False
+        return True
+
+    def _start_listener(self, listener: Callable[[List[DocumentResult]], None],
+                        normalize: bool = True) -> Tuple[int, str]:
+        """Register a result receiver and start capturing from the frame fetcher."""
+        self.receiver = MyCapturedResultReceiver(listener, self.fetcher, normalize, self.tracker, self.roi)
         self.cvr_instance.add_result_receiver(self.receiver)
-        error_code, error_message = self.cvr_instance.start_capturing(EnumPresetTemplate.PT_DETECT_AND_NORMALIZE_DOCUMENT)
+        template = (EnumPresetTemplate.PT_DETECT_AND_NORMALIZE_DOCUMENT if normalize
+                    else EnumPresetTemplate.PT_DETECT_DOCUMENT_BOUNDARIES)
+        error_code, error_message = self.cvr_instance.start_capturing(template)
+        if error_code != EnumErrorCode.EC_OK:
+            # Without capturing, detectMatAsync() must keep refusing frames.
+            self.cvr_instance.remove_result_receiver(self.receiver)
+            self.receiver = None
+        return error_code, error_message
 
     def clearAsyncListener(self) -> None:
         """
@@ -293,7 +988,57 @@ class DocumentScanner:
             self.cvr_instance.remove_result_receiver(self.receiver)
             self.receiver = None
         self.cvr_instance.stop_capturing()
-        
+        self.fetcher.clear()
+        self.tracker = None
+        if self.dispatcher is not None:
+            self.dispatcher.close()
+            self.dispatcher = None
+
+    def add_stage_hook(self, hook: StageHook) -> None:
+        """
+        Call hook(name, ns) after every timed stage, turning instrumentation on if needed.
+
+        Stage names are "detect.downscale", "detect.convert" (numpy to ImageData),
+        "detect.router_wait", "detect.capture" and "detect.unpack" (building
+        DocumentResults); "normalize.convert", "normalize.router_wait",
+        "normalize.settings" (pushing the ROI into the template),
+        "normalize.capture" and "normalize.unpack"; and "async.convert" and
+        "async.enqueue" for detectMatAsync().
+
+        Args:
+            hook (callable): Called on the thread that ran the stage, with the
+                             stage name and its duration in nanoseconds.
+
+        Example:
+            scanner.add_stage_hook(lambda name, ns: histogram.labels(name).observe(ns / 1e9))
+        """
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation()
+        self.instrumentation.add_hook(hook)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the scanner's counters in one dictionary.
+
+        Returns:
+            dict: "stages" maps each timed stage to its calls, bytes copied,
+                  duration summary in milliseconds and log2 histogram, and is
+                  empty unless instrumentation is on. "frames" holds the
+                  detectMatAsync() frame counters. "cache", "dispatch",
+                  "change_filter", "tracker" and "roi" are present when the
+                  corresponding feature is enabled.
+        """
+        stats: Dict[str, Any] = {
+            "stages": self.instrumentation.stats() if self.instrumentation is not None else {},
+            "frames": self.fetcher.stats(),
+        }
+        for name, component in (("cache", self.cache), ("dispatch", self.dispatcher),
+                                ("change_filter", self.change_filter), ("tracker", self.tracker),
+                                ("roi", self.roi)):
+            if component is not None:
+                stats[name] = component.stats()
+        return stats
+
     def detect(self, input: Union[str, np.ndarray]) -> List[DocumentResult]:
         """
         Detect documents in images from various input sources.
@@ -342,24 +1087,302 @@ class DocumentScanner:
         Note:
             For real-time processing, use detectMatAsync() with addAsyncListener()
             instead of calling this method repeatedly in a loop.
+
+            With roi_margin set, arrays are treated as consecutive frames of
+            one stream: each is searched only around the documents found in
+            the previous one. File paths are always searched in full.
+        """
+        try:
+            if self.roi is not None and isinstance(input, np.ndarray):
+                view, offset = self.roi.crop(input)
+                output = self._detect(view, input)
+                if offset is not None:
+                    for document in output:
+                        document.quad += offset
+                self.roi.update(stack_quads(output), offset is not None)
+                return output
+            return self._detect(self._cached(input), input)
+        except CaptureError as err:
+            print("Error:", err.error_code, err.error_string)
+            return []
+
+    def _detect(self, image: Union[str, np.ndarray, ImageData], source: Any) -> List[DocumentResult]:
+        """
+        Run boundary detection on one image and raise on SDK errors.
+
+        Args:
+            image: The image handed to the SDK.
+            source: The value stored in DocumentResult.source for later normalization.
+
+        Returns:
+            List[DocumentResult]: The detected documents.
+
+        Raises:
+            CaptureError: If the SDK reports an error.
         """
-        result = self.cvr_instance.capture(input, EnumPresetTemplate.PT_DETECT_DOCUMENT_BOUNDARIES)
+        instrumentation = self.instrumentation
+        start = time.perf_counter_ns() if instrumentation is not None else 0
+        scale = None
+        if self.detection_max_side is not None:
+            if isinstance(image, str):
+                decoded = self._decode_source(image)
+                if decoded is not None:
+                    image = decoded
+            image, scale = _downscale(image, self.detection_max_side)
+            if instrumentation is not None:
+                start = instrumentation.lap("detect.downscale", start)
+
+        data = _capture_input(image)
+        if instrumentation is not None:
+            start = instrumentation.lap("detect.convert", start, image.nbytes if isinstance(image, np.ndarray) else 0)
+        with self.pool.router() as cvr:
+            if instrumentation is not None:
+                start = instrumentation.lap("detect.router_wait", start)
+            result = cvr.capture(data, EnumPresetTemplate.PT_DETECT_DOCUMENT_BOUNDARIES)
+        if instrumentation is not None:
+            start = instrumentation.lap("detect.capture", start)
+
+        if result.get_error_code() != EnumErrorCode.EC_OK:
+            raise CaptureError(result.get_error_code(), result.get_error_string())
 
         output: List[DocumentResult] = []
+        for item in result.get_items():
+            document = DocumentResult(item)
+            if scale is not None:
+                document.quad *= scale
+            document.source = source
+            output.append(document)
+        if instrumentation is not None:
+            instrumentation.lap("detect.unpack", start)
+        return output
+
+    def _detect_batch_item(self, input: Union[str, np.ndarray]) -> Union[List[DocumentResult], Exception]:
+        """Decode and detect one batch input, returning any error as a value."""
+        try:
+            image = input
+            if isinstance(input, str):
+                # Both decoders release the GIL, so this overlaps with
+                # captures running on the other workers.
+                image = self.cache.get(input) if self.cache is not None else cv2.imread(input)
+                if image is None:
+                    raise IOError(f"Cannot read image: {input}")
+            return self._detect(image, input)
+        except Exception as err:
+            return err
+
+    def detect_batch(self, inputs: Iterable[Union[str, np.ndarray]], workers: Optional[int] = None,
+                     ordered: bool = False) -> Iterator[Tuple[int, Union[List[DocumentResult], Exception]]]:
+        """
+        Detect documents in many images using a pool of worker threads.
+
+        Each worker decodes its image and then runs the capture on a router from
+        the scanner's pool, so decoding of one image overlaps with SDK capture of
+        others. Only a bounded number of inputs is in flight at once, which keeps
+        memory flat for arbitrarily long (or lazy) input iterables.
+
+        Args:
+            inputs (Iterable[Union[str, np.ndarray]]): File paths or OpenCV matrices.
+            workers (int, optional): Number of worker threads. Defaults to the
+                                     router pool size.
+            ordered (bool): If True, yield results in input order. If False,
+                            yield each result as soon as it completes.
+
+        Yields:
+            Tuple[int, Union[List[DocumentResult], Exception]]: The input index and
+            either the detected documents or the exception raised for that input.
+            Errors are never printed or raised; failed inputs yield their exception.
+            DocumentResult.source is set to the original input.
+
+        Example:
+            for index, results in scanner.detect_batch(paths, ordered=True):
+                if isinstance(results, Exception):
+                    print(f"{paths[index]} failed: {results}")
+                    continue
+                for result in results:
+                    scanner.normalize(result, EnumImageColourMode.ICM_COLOUR)
+        """
+        if workers is None:
+            workers = self.pool.size
+        max_in_flight = workers * 2
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            submit = lambda input: executor.submit(self._detect_batch_item, input)
+            for index, future in _iter_windowed(submit, inputs, max_in_flight, ordered):
+                yield index, future.result()
+
+    def scan_stream(self, frames: Iterable[np.ndarray], prefetch: Optional[int] = None,
+                    workers: Optional[int] = None,
+                    colour_mode: Optional[EnumImageColourMode] = None) -> Iterator[Tuple[int, Union[List[DocumentResult], Exception]]]:
+        """
+        Scan a stream of frames, yielding results in frame order.
+
+        frames may be any iterable, such as a generator over a video decoder or
+        a network receiver. It is read lazily on the caller's thread, and only
+        when fewer than prefetch frames are in flight, so a slow consumer
+        holds back the source instead of queuing frames in memory. Each frame
+        is converted to ImageData once, and detection and the optional
+        normalization then run on that copy on a worker thread, overlapping
+        with the conversion and detection of the following frames.
+
+        Args:
+            frames (Iterable[np.ndarray]): The frames to scan.
+            prefetch (int, optional): Maximum number of frames read but not yet
+                                      yielded. Defaults to twice workers.
+            workers (int, optional): Number of worker threads. Defaults to the
+                                     router pool size.
+            colour_mode (EnumImageColourMode, optional): If set, every detected
+                document is also normalized, and normalized_image is filled in.
+
+        Yields:
+            Tuple[int, Union[List[DocumentResult], Exception]]: The frame index and
+            either the detected documents or the exception raised for that frame.
+            DocumentResult.source is set to the frame.
+
+        Note:
+            Frames are scanned independently and out of order, so roi_margin
+            does not apply here.
+
+        Example:
+            capture = cv2.VideoCapture("pages.mp4")
+
+            def frames():
+                while True:
+                    ok, frame = capture.read()
+                    if not ok:
+                        return
+                    yield frame
+
+            for index, results in scanner.scan_stream(frames(), colour_mode=EnumImageColourMode.ICM_COLOUR):
+                for result in results:
+                    cv2.imwrite(f"page-{index}.png", result.normalized_image)
+        """
+        if workers is None:
+            workers = self.pool.size
+        if prefetch is None:
+            prefetch = workers * 2
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            submit = lambda frame: executor.submit(self._scan_frame, frame, colour_mode)
+            for index, future in _iter_windowed(submit, frames, max(prefetch, 1), True):
+                yield index, future.result()
+
+    def scan_video(self, path: str, sample_fps: Optional[float] = 5.0, max_frames: Optional[int] = None,
+                   workers: Optional[int] = None,
+                   colour_mode: EnumImageColourMode = EnumImageColourMode.ICM_COLOUR,
+                   min_segment_frames: int = 2, page_change: float = 20.0) -> List['VideoPage']:
+        """
+        Extract the pages of a video of a document, one normalized image per page.
+
+        The video is decoded on a read-ahead thread. With sample_fps, only
+        every n-th frame is converted to an array; the others are grabbed
+        and skipped. The sampled frames are detected on worker threads
+        through scan_stream().
+        Consecutive frames showing the same page form a segment, and the
+        sharpest frame of each segment is normalized.
+
+        Args:
+            path (str): The video file.
+            sample_fps (float, optional): Frames per second to scan. None scans
+                                          every frame.
+            max_frames (int, optional): Stop after this many sampled frames.
+            workers (int, optional): Number of detection threads. Defaults to
+                                     the router pool size.
+            colour_mode (EnumImageColourMode): Color mode of the pages.
+            min_segment_frames (int): Segments with fewer sampled frames, such
+                                      as the frames of a page turn, are skipped.
+            page_change (float): Mean gray-level difference between two
+                                 consecutive page thumbnails that starts a new
+                                 segment.
+
+        Returns:
+            List[VideoPage]: For each segment, the frame index, the time in
+            seconds and the DocumentResult with normalized_image set.
+
+        Raises:
+            IOError: If the video cannot be opened.
+
+        Example:
+            for page in scanner.scan_video("pages.mp4", sample_fps=4):
+                cv2.imwrite(f"page-{page.frame_index}.png", page.result.normalized_image)
+        """
+        from .video import scan_video
+
+        return scan_video(self, path, sample_fps, max_frames, workers, colour_mode,
+                          min_segment_frames, page_change)
+
+    def _scan_frame(self, frame: np.ndarray,
+                    colour_mode: Optional[EnumImageColourMode]) -> Union[List[DocumentResult], Exception]:
+        """Detect and optionally normalize one stream frame, returning any error as a value."""
+        try:
+            image = convertMat2ImageData(frame)
+            documents = self._detect(image, frame)
+            if colour_mode is not None:
+                for document in documents:
+                    self._normalize(document, colour_mode, image)
+            return documents
+        except Exception as err:
+            return err
+
+    def detectAndNormalize(self, input: Union[str, np.ndarray],
+                           colour_mode: EnumImageColourMode = EnumImageColourMode.ICM_COLOUR) -> List[DocumentResult]:
+        """
+        Detect documents and normalize them in a single capture.
+
+        Unlike calling detect() followed by normalize(), this decodes the input
+        once and runs one capture with the PT_DETECT_AND_NORMALIZE_DOCUMENT
+        template, which is the same template the async listener uses.
+
+        Args:
+            input (Union[str, np.ndarray]): File path or OpenCV image matrix.
+            colour_mode (EnumImageColourMode): Color mode for the normalized images.
+
+        Returns:
+            List[DocumentResult]: Detected documents with boundary coordinates and
+                                normalized_image set. Empty list if no documents
+                                found or an error occurred.
+
+        Note:
+            With detection_max_side set, detection runs on a downscaled copy
+            and each document is then normalized from the full-resolution
+            image, which takes one capture per document instead of one in total.
+
+        Example:
+            for result in scanner.detectAndNormalize("document.jpg", EnumImageColourMode.ICM_GRAYSCALE):
+                cv2.imwrite("output.png", result.normalized_image)
+        """
+        if self.detection_max_side is not None:
+            image = self._decode_source(input)
+            if image is None:
+                print("Error: cannot read", input)
+                return []
+            try:
+                output = self._detect(image, input)
+            except CaptureError as err:
+                print("Error:", err.error_code, err.error_string)
+                return []
+            for document in output:
+                self._normalize(document, colour_mode, image)
+            return output
+
+        with self.pool.router() as cvr:
+            error_code, error_message = self._update_template(cvr, EnumPresetTemplate.PT_DETECT_AND_NORMALIZE_DOCUMENT,
+                                                              colour_mode)
+            if error_code != EnumErrorCode.EC_OK:
+                print("Error:", error_code, error_message)
+                return []
+            result = cvr.capture(_capture_input(input), EnumPresetTemplate.PT_DETECT_AND_NORMALIZE_DOCUMENT)
 
         if result.get_error_code() != EnumErrorCode.EC_OK:
             print("Error:", result.get_error_code(),
                     result.get_error_string())
-        else:
-            items = result.get_items()
-            for item in items:
-                document = DocumentResult(item)
-                document.source = input
-                output.append(document)
+            return []
 
+        output = _deskewed_documents(result)
+        for document in output:
+            document.source = input
         return output
 
-    def detectMatAsync(self, mat: np.ndarray) -> None:
+    def detectMatAsync(self, mat: np.ndarray, timeout: Optional[float] = None) -> bool:
         """
         Add an OpenCV matrix to the async processing queue.
 
@@ -368,6 +1391,31 @@ class DocumentScanner:
         
         Args:
             mat (numpy.ndarray): OpenCV image matrix to process asynchronously.
+            timeout (float, optional): With the BLOCK overflow policy, seconds to
+                                       wait for room in the frame buffer.
+
+        Returns:
+            bool: True if the frame was queued, False if it was dropped or
+                  no listener is running.
+
+        Note:
+            With detection_max_side set, the frame is downscaled before it is
+            queued. Result coordinates are mapped back to full resolution, but
+            normalized_image comes from the downscaled frame.
+
+            With frame_history set, the scanner keeps the frame and the results
+            carry its frame_id, so normalize(result) can warp it later. When
+            detection_max_side is also set, the array itself is kept rather than
+            a copy, so do not modify it in place after submitting it.
+
+            With tracking enabled by addAsyncListener(redetect_interval=...),
+            frames that the tracker can follow are not queued: their results
+            are passed to the listener before this call returns. Such frames
+            are kept in the frame history as the array itself, too.
+
+            With roi_margin set, only the region around the last documents
+            found is queued, and results are offset back to full-frame
+            coordinates. The frame history then keeps the array itself.
         
         Example:
             reader.addAsyncListener(my_callback)
@@ -375,9 +1423,42 @@ class DocumentScanner:
                 frame = camera.read()
                 reader.detectMatAsync(frame)
         """
-        self.fetcher.add_frame(convertMat2ImageData(mat))
+        tracker, receiver = self.tracker, self.receiver
+        if receiver is None:
+            # Nothing fetches frames without a listener and the SDK discards
+            # them, so none is registered in the pending set or the history.
+            return False
+        track_frame = None
+        if tracker is not None:
+            track_frame = tracker.prepare(mat)
+            quads = tracker.track(track_frame)
+            if quads is not None:
+                frame_id = self.fetcher.remember(mat)
+                documents = [DocumentResult(quad=quad) for quad in quads]
+                for document in documents:
+                    document.frame_id = frame_id
+                    document.tracked = True
+                if self.roi is not None:
+                    self.roi.update(quads, True)
+                receiver.listener(documents)
+                return True
 
-    def normalize(self, document: DocumentResult, color: EnumImageColourMode) -> Optional[np.ndarray]:
+        view, offset = (mat, None) if self.roi is None else self.roi.crop(mat)
+        small, scale = _downscale(view, self.detection_max_side)
+        keep = mat if scale is not None or offset is not None else None
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return self.fetcher.add_frame(convertMat2ImageData(small), timeout, scale,
+                                          keep, track_frame, offset)
+        start = time.perf_counter_ns()
+        data = convertMat2ImageData(small)
+        start = instrumentation.lap("async.convert", start, small.nbytes)
+        added = self.fetcher.add_frame(data, timeout, scale, keep, track_frame, offset)
+        instrumentation.lap("async.enqueue", start)
+        return added
+
+    def normalize(self, document: DocumentResult,
+                  color: EnumImageColourMode = EnumImageColourMode.ICM_COLOUR) -> Optional[np.ndarray]:
         """
         Perform document normalization (perspective correction) on a detected document.
         
@@ -388,7 +1469,9 @@ class DocumentScanner:
         
         Args:
             document (DocumentResult): Document containing boundary coordinates (x1,y1 to x4,y4)
-                                     and source image data. The source must be set in document.source.
+                                     and source image data. The source must be set in document.source,
+                                     or document.frame_id must name a frame still in
+                                     the scanner's frame history (see frame_history).
             color (EnumImageColourMode): Color mode for the normalized image:
                                        - ICM_COLOUR: Full color output
                                        - ICM_GRAYSCALE: Grayscale output  
@@ -401,6 +1484,7 @@ class DocumentScanner:
         
         Process:
             1. Configures ROI settings using document boundary coordinates
+               (settings are pre-built per color mode; only the ROI is pushed)
             2. Sets the desired color mode for output
             3. Captures normalized image using PT_NORMALIZE_DOCUMENT template
             4. Converts SDK ImageData to numpy array format using convertNormalizedImage2Mat
@@ -431,15 +1515,50 @@ class DocumentScanner:
             Use the return value for immediate processing or document.normalized_image for
             later access.
         """
-        
-        error_code, error_message, settings = self.cvr_instance.get_simplified_settings(EnumPresetTemplate.PT_NORMALIZE_DOCUMENT)
-        quad = Quadrilateral()
-        quad.points = [Point(document.x1, document.y1), Point(document.x2, document.y2), Point(document.x3, document.y3), Point(document.x4, document.y4)]
-        settings.roi = quad
-        settings.roi_measured_in_percentage = 0
-        settings.document_settings.colour_mode = color
-        error_code, error_message = self.cvr_instance.update_settings(EnumPresetTemplate.PT_NORMALIZE_DOCUMENT,settings)
-        result = self.cvr_instance.capture(document.source, EnumPresetTemplate.PT_NORMALIZE_DOCUMENT)
+        source = self._document_source(document)
+        if source is None:
+            if document.frame_id is not None:
+                print("Error: frame", document.frame_id, "is no longer in the frame history")
+            else:
+                print("Error: document has no source image")
+            return None
+        return self._normalize(document, color, self._cached(source))
+
+    def _document_source(self, document: DocumentResult) -> Any:
+        """Return a document's source, or its buffered frame for async results."""
+        if document.source is None and document.frame_id is not None:
+            return self.fetcher.frame(document.frame_id)
+        return document.source
+
+    def _normalize(self, document: DocumentResult, color: EnumImageColourMode,
+                   image: Union[str, np.ndarray, ImageData]) -> Optional[np.ndarray]:
+        """
+        Normalize one document, capturing from the given image instead of document.source.
+
+        Args:
+            document (DocumentResult): Document whose quad is used as the ROI.
+            color (EnumImageColourMode): Color mode for the normalized image.
+            image: The decoded or encoded source image handed to the SDK.
+
+        Returns:
+            numpy.ndarray or None: The normalized image, also stored in document.normalized_image.
+        """
+        instrumentation = self.instrumentation
+        start = time.perf_counter_ns() if instrumentation is not None else 0
+        data = _capture_input(image)
+        if instrumentation is not None:
+            start = instrumentation.lap("normalize.convert", start,
+                                        image.nbytes if isinstance(image, np.ndarray) else 0)
+        with self.pool.router() as cvr:
+            if instrumentation is not None:
+                start = instrumentation.lap("normalize.router_wait", start)
+            points = tuple((int(round(x)), int(round(y))) for x, y in document.quad.tolist())
+            error_code, error_message = self._update_template(cvr, EnumPresetTemplate.PT_NORMALIZE_DOCUMENT, color, points)
+            if instrumentation is not None:
+                start = instrumentation.lap("normalize.settings", start)
+            result = cvr.capture(data, EnumPresetTemplate.PT_NORMALIZE_DOCUMENT)
+        if instrumentation is not None:
+            start = instrumentation.lap("normalize.capture", start)
         if result.get_error_code() != EnumErrorCode.EC_OK:
             print("Error:", result.get_error_code(),
                     result.get_error_string())
@@ -447,10 +1566,12 @@ class DocumentScanner:
             items = result.get_items()
             if len(items) > 1:  
                 item = items[1]
-                image: ImageData = item.get_image_data()
-                if image is not None:
+                normalized: ImageData = item.get_image_data()
+                if normalized is not None:
                 
-                    mat = convertNormalizedImage2Mat(image)
+                    mat = convertNormalizedImage2Mat(normalized)
+                    if instrumentation is not None:
+                        instrumentation.lap("normalize.unpack", start, mat.nbytes)
                     if error_code == EnumErrorCode.EC_OK:
                         document.normalized_image = mat
                         return mat
@@ -461,6 +1582,85 @@ class DocumentScanner:
 
         return None
 
+    def _cached(self, source: Any) -> Any:
+        """Return the cached decode of a file path source, or the source unchanged."""
+        if self.cache is not None and isinstance(source, str):
+            image = self.cache.get(source)
+            if image is not None:
+                return image
+        return source
+
+    def _decode_source(self, source: Union[str, np.ndarray, ImageData]) -> Optional[ImageData]:
+        """
+        Decode a DocumentResult source into ImageData so it can be captured repeatedly.
+
+        Args:
+            source: A file path, an OpenCV matrix or an ImageData.
+
+        Returns:
+            ImageData or None: The decoded image, or None if a file could not be read.
+        """
+        if isinstance(source, ImageData):
+            return source
+        if isinstance(source, str):
+            if self.cache is not None:
+                return self.cache.get(source)
+            error_code, image = ImageIO().read_from_file(source)
+            return image if error_code == EnumErrorCode.EC_OK else None
+        return convertMat2ImageData(source)
+
+    def normalize_many(self, results: List[DocumentResult],
+                       colour_mode: EnumImageColourMode = EnumImageColourMode.ICM_COLOUR) -> List[Optional[np.ndarray]]:
+        """
+        Normalize several detected documents, decoding each source image only once.
+
+        Results are grouped by their source. Each source is decoded into an
+        ImageData once, and the quads that share it are normalized in parallel
+        on routers from the scanner's pool. This suits frames holding several
+        documents, such as receipts on a table or both sides of an ID card.
+
+        Args:
+            results (List[DocumentResult]): Documents returned by detect(), possibly
+                                            from several different sources.
+            colour_mode (EnumImageColourMode): Color mode for the normalized images.
+
+        Returns:
+            List[Optional[numpy.ndarray]]: Normalized images in the same order as
+                                         results, with None for documents that
+                                         failed. Each image is also stored in
+                                         the matching result's normalized_image.
+
+        Example:
+            results = scanner.detect("receipts.jpg")
+            for image in scanner.normalize_many(results, EnumImageColourMode.ICM_GRAYSCALE):
+                if image is not None:
+                    cv2.imshow("Receipt", image)
+        """
+        groups: Dict[Any, List[int]] = {}
+        sources: Dict[Any, Any] = {}
+        for index, document in enumerate(results):
+            source = self._document_source(document)
+            key = source if isinstance(source, str) else id(source)
+            groups.setdefault(key, []).append(index)
+            sources[key] = source
+
+        output: List[Optional[np.ndarray]] = [None] * len(results)
+        workers = min(self.pool.size, max((len(indices) for indices in groups.values()), default=1))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for key, indices in groups.items():
+                image = self._decode_source(sources[key]) if sources[key] is not None else None
+                if image is None:
+                    print("Error: cannot read image", sources[key])
+                    continue
+                futures = [(index, executor.submit(self._normalize, results[index], colour_mode, image))
+                           for index in indices]
+                for index, future in futures:
+                    output[index] = future.result()
+
+        return output
+
+
 def initLicense(licenseKey: str) -> Tuple[int, str]:
     """
     Initialize the Dynamsoft license for document detection.
@@ -482,12 +1682,39 @@ def initLicense(licenseKey: str) -> Tuple[int, str]:
     errorCode, errorMsg = LicenseManager.init_license(licenseKey)
     return errorCode, errorMsg
 
-def createInstance() -> DocumentScanner:
+def createInstance(pool_size: Optional[int] = None, cache_bytes: int = 0,
+                   frame_buffer_size: Optional[int] = None, frame_overflow: str = DROP_OLDEST,
+                   max_frame_age: Optional[float] = None,
+                   detection_max_side: Optional[int] = None, frame_history: int = 0,
+                   roi_margin: Optional[float] = None, roi_max_misses: int = 3,
+                   instrument: bool = False) -> DocumentScanner:
     """
     Create a new DocumentScanner instance.
     
     This is the preferred way to create a DocumentScanner. Make sure to
     call initLicense() first.
+
+    Args:
+        pool_size (int, optional): Maximum number of routers for concurrent
+                                   detect()/normalize() calls. Defaults to the
+                                   number of CPU cores.
+        cache_bytes (int): Size in bytes of the decoded-image cache for file
+                           path sources. 0 (the default) disables it.
+        frame_buffer_size (int, optional): Maximum number of frames queued by
+                                           detectMatAsync(). None keeps every frame.
+        frame_overflow (str): DROP_OLDEST (the default), DROP_NEWEST or BLOCK.
+        max_frame_age (float, optional): Maximum age in seconds of a delivered frame.
+        detection_max_side (int, optional): Longest side, in pixels, of the
+                                            downscaled copy used for detection.
+                                            None detects at full resolution.
+        frame_history (int): Number of recent detectMatAsync() frames kept for
+                             normalize() on async results. 0 keeps none.
+        roi_margin (float, optional): Search consecutive frames only around the
+                                      last documents found, grown by this
+                                      fraction on each side. None searches
+                                      whole frames.
+        roi_max_misses (int): Empty region searches before a full-frame search.
+        instrument (bool): Record per-stage timings, reported by stats().
     
     Returns:
         DocumentScanner: A new DocumentScanner instance ready for use.
@@ -497,73 +1724,48 @@ def createInstance() -> DocumentScanner:
         reader = createInstance()
         results = reader.detectFile("document.jpg")
     """
-    return DocumentScanner()
+    return DocumentScanner(pool_size, cache_bytes, frame_buffer_size, frame_overflow, max_frame_age,
+                           detection_max_side, frame_history, roi_margin, roi_max_misses, instrument)
 
-def convertMat2ImageData(mat: np.ndarray) -> ImageData:
+def _capture_input(image: Any) -> Any:
     """
-    Convert an OpenCV matrix to Dynamsoft ImageData format.
-    
-    This utility function handles the conversion between OpenCV's numpy
-    array format and the SDK's ImageData format, including proper
-    pixel format detection for RGB and grayscale images.
-    
-    Args:
-        mat (numpy.ndarray): OpenCV image matrix (RGB, BGR, or grayscale).
-    
-    Returns:
-        ImageData: Converted image data ready for SDK processing.
-    
-    Note:
-        - 3-channel images are treated as RGB_888
-        - Single-channel images are treated as grayscale
-        - The function automatically determines stride and pixel format
+    Prepare an image for CaptureVisionRouter.capture().
+
+    capture() converts arrays itself, but it labels every array RGB_888 and
+    pairs the compacted bytes with the view's original strides[0], which is
+    wrong for grayscale images and for non-contiguous views. Arrays are
+    therefore converted with convertMat2ImageData() instead.
     """
-    if len(mat.shape) == 3:
-        height, width, channels = mat.shape
-        pixel_format = EnumImagePixelFormat.IPF_RGB_888
-    else:
-        height, width = mat.shape
-        channels = 1
-        pixel_format = EnumImagePixelFormat.IPF_GRAYSCALED
-
-    stride = width * channels
-    imagedata = ImageData(mat.tobytes(), width, height, stride, pixel_format)
-    return imagedata
-
-def convertNormalizedImage2Mat(normalized_image: ImageData) -> np.ndarray:
+    if isinstance(image, np.ndarray):
+        return convertMat2ImageData(image)
+    return image
+
+
+def _downscale(image: Any, max_side: Optional[int]) -> Tuple[Any, Optional[np.ndarray]]:
     """
-    Convert a Dynamsoft ImageData object to an OpenCV-compatible numpy array.
-    
-    This utility function handles the conversion from the SDK's ImageData format
-    back to OpenCV's numpy array format, supporting various pixel formats including
-    binary, grayscale, and color images.
-    
+    Shrink an image for detection so that its longer side is at most max_side.
+
     Args:
-        normalized_image (ImageData): The ImageData object from SDK normalization results
-        
+        image (numpy.ndarray or ImageData): The full-resolution image.
+        max_side (int, optional): Longest side of the result. None disables scaling.
+
     Returns:
-        numpy.ndarray: OpenCV-compatible image matrix
-        
-    Supported Formats:
-        - Binary images: Single channel 8-bit
-        - Grayscale images: Single channel 8-bit
-        - Color images: 3-channel RGB format
-        
-    Note:
-        The function automatically detects the pixel format and handles
-        stride/padding for proper image reconstruction.
+        tuple: The image to detect on and the (x, y) factors that map its
+               coordinates back to the original, or the image unchanged and
+               None if it is already small enough.
     """
-    
-    image_bytes = normalized_image.get_bytes()
-    width = normalized_image.get_width()
-    height = normalized_image.get_height()
-    pixel_format = normalized_image.get_image_pixel_format() 
-    if pixel_format == EnumImagePixelFormat.IPF_GRAYSCALED or pixel_format == EnumImagePixelFormat.IPF_BINARY or pixel_format == EnumImagePixelFormat.IPF_BINARY_8:
-        channels = 1
-        mat = np.frombuffer(image_bytes, dtype=np.uint8).reshape(height, width)
-        return mat
-    
-    else:
-        channels = 3
-        mat = np.frombuffer(image_bytes, dtype=np.uint8).reshape(height, width, channels)
-        return mat
\ No newline at end of file
+    if max_side is None:
+        return image, None
+    mat = convertNormalizedImage2Mat(image) if isinstance(image, ImageData) else image
+    height, width = mat.shape[:2]
+    if max(height, width) <= max_side:
+        return image, None
+
+    factor = max_side / max(height, width)
+    size = (max(1, round(width * factor)), max(1, round(height * factor)))
+    small = cv2.resize(mat, size, interpolation=cv2.INTER_AREA)
+    scale = np.array([width / size[0], height / size[1]], dtype=np.float32)
+    if isinstance(image, ImageData) and image.get_image_pixel_format() in _PACKED_PIXEL_CHANNELS:
+        # Keep the decoder's channel order, which convertMat2ImageData would relabel.
+        small = ImageData(small.tobytes(), size[0], size[1], small.strides[0], image.get_image_pixel_format())
+    return small, scale
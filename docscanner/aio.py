@@ -0,0 +1,293 @@
+"""
+asyncio front end for DocumentScanner.
+
+AsyncDocumentScanner exposes awaitable detect()/normalize() calls for event
+loop based services such as aiohttp. The blocking SDK captures run on a
+bounded thread pool sized to the scanner's router pool, so the event loop
+never waits on the SDK.
+
+stream() turns the callback-based async listener into an async iterator.
+Results arrive on an SDK thread and are handed to the event loop with
+call_soon_threadsafe(). The stream ends with a sentinel once every frame
+has been delivered or dropped, or when the scanner is closed.
+
+Example:
+    from docscanner.aio import AsyncDocumentScanner
+
+    async with AsyncDocumentScanner(pool_size=4) as scanner:
+        results = await scanner.detect("document.jpg")
+        images = await scanner.normalize_many(results)
+
+    async with AsyncDocumentScanner(pool_size=4) as scanner:
+        async for results in scanner.stream(camera_frames()):
+            for result in results:
+                print(result.quad)
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from . import (
+    DROP_OLDEST,
+    CaptureError,
+    DocumentResult,
+    DocumentScanner,
+    EnumErrorCode,
+    EnumImageColourMode,
+)
+
+# Returned by next() when a plain frame iterable is exhausted, and queued
+# to end a stream.
+_DONE = object()
+
+
+class AsyncDocumentScanner:
+    """
+    Awaitable wrapper around a DocumentScanner.
+
+    detect(), detectAndNormalize(), normalize() and normalize_many() run the
+    matching DocumentScanner method on a thread pool of ``workers`` threads,
+    so at most that many captures are in progress at once. Each call checks
+    a router out of the scanner's RouterPool, as in the synchronous API.
+
+    Only one stream() can run at a time, because it uses the scanner's single
+    async listener router.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None, cache_bytes: int = 0,
+                 workers: Optional[int] = None, frame_buffer_size: Optional[int] = 2,
+                 frame_overflow: str = DROP_OLDEST, max_frame_age: Optional[float] = None,
+                 detection_max_side: Optional[int] = None, frame_history: int = 0,
+                 roi_margin: Optional[float] = None, roi_max_misses: int = 3,
+                 instrument: bool = False) -> None:
+        """
+        Create the underlying scanner and its thread pool.
+
+        Args:
+            pool_size (int, optional): Maximum number of routers. Defaults to the
+                                       number of CPU cores.
+            cache_bytes (int): Size in bytes of the decoded-image cache. 0 disables it.
+            workers (int, optional): Number of executor threads. Defaults to the
+                                     router pool size.
+            frame_buffer_size (int, optional): Frame buffer depth used by stream().
+                                               Defaults to 2, so a slow consumer
+                                               sees recent frames rather than a backlog.
+            frame_overflow (str): Overflow policy of the frame buffer.
+            max_frame_age (float, optional): Maximum age in seconds of a streamed frame.
+            detection_max_side (int, optional): Longest side of the downscaled
+                                                copy used for detection.
+            frame_history (int): Number of streamed frames kept so that
+                                 normalize() can warp a stream result later.
+            roi_margin (float, optional): Search streamed frames only around the
+                                          last documents found.
+            roi_max_misses (int): Empty region searches before a full-frame search.
+            instrument (bool): Record per-stage timings, reported by scanner.stats().
+        """
+        self.scanner: DocumentScanner = DocumentScanner(pool_size, cache_bytes, frame_buffer_size,
+                                                        frame_overflow, max_frame_age,
+                                                        detection_max_side, frame_history,
+                                                        roi_margin, roi_max_misses, instrument)
+        self.workers: int = workers or self.scanner.pool.size
+        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix="docscanner")
+        self._streaming = False
+        # Ends the running stream(), if any. Set by stream() on its event loop.
+        self._end_stream: Optional[Callable[[], None]] = None
+
+    async def __aenter__(self) -> "AsyncDocumentScanner":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        End a running stream() and shut the thread pool down.
+
+        The wait for running captures happens on a helper thread, so the
+        event loop keeps running meanwhile.
+        """
+        if self._end_stream is not None:
+            self._end_stream()
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown, True)
+
+    def close(self) -> None:
+        """
+        Blocking aclose() for callers outside the event loop.
+
+        Do not call it from a coroutine, because it blocks until running
+        captures finish.
+        """
+        if self._end_stream is not None:
+            self._end_stream()
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, func: Any, *args: Any) -> Any:
+        """Run a blocking call on the executor and await its result."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def detect(self, input: Union[str, np.ndarray]) -> List[DocumentResult]:
+        """
+        Awaitable DocumentScanner.detect().
+
+        Args:
+            input (Union[str, np.ndarray]): File path or OpenCV image matrix.
+
+        Returns:
+            List[DocumentResult]: Detected documents. Empty list if none were found.
+        """
+        return await self._run(self.scanner.detect, input)
+
+    async def detectAndNormalize(self, input: Union[str, np.ndarray],
+                                 colour_mode: EnumImageColourMode = EnumImageColourMode.ICM_COLOUR) -> List[DocumentResult]:
+        """
+        Awaitable DocumentScanner.detectAndNormalize().
+
+        Args:
+            input (Union[str, np.ndarray]): File path or OpenCV image matrix.
+            colour_mode (EnumImageColourMode): Color mode for the normalized images.
+
+        Returns:
+            List[DocumentResult]: Detected documents with normalized_image set.
+        """
+        return await self._run(self.scanner.detectAndNormalize, input, colour_mode)
+
+    async def normalize(self, document: DocumentResult,
+                        color: EnumImageColourMode = EnumImageColourMode.ICM_COLOUR) -> Optional[np.ndarray]:
+        """
+        Awaitable DocumentScanner.normalize().
+
+        Args:
+            document (DocumentResult): A document returned by detect().
+            color (EnumImageColourMode): Color mode for the normalized image.
+
+        Returns:
+            numpy.ndarray or None: The normalized image, also stored in
+                                   document.normalized_image.
+        """
+        return await self._run(self.scanner.normalize, document, color)
+
+    async def normalize_many(self, results: List[DocumentResult],
+                             colour_mode: EnumImageColourMode = EnumImageColourMode.ICM_COLOUR) -> List[Optional[np.ndarray]]:
+        """
+        Awaitable DocumentScanner.normalize_many().
+
+        Args:
+            results (List[DocumentResult]): Documents returned by detect().
+            colour_mode (EnumImageColourMode): Color mode for the normalized images.
+
+        Returns:
+            List[Optional[np.ndarray]]: Normalized images in the order of results.
+        """
+        return await self._run(self.scanner.normalize_many, results, colour_mode)
+
+    async def stream(self, frames: Union[AsyncIterable[np.ndarray], Iterable[np.ndarray]],
+                     max_pending: int = 8, normalize: bool = True) -> AsyncIterator[List[DocumentResult]]:
+        """
+        Detect and normalize documents in a stream of frames.
+
+        Frames are fed to the scanner's async listener path in a background
+        task. The SDK callbacks are moved onto the event loop with
+        call_soon_threadsafe(), and the result lists are yielded in arrival order.
+        A plain iterable is read on the executor, so a blocking source such as
+        cv2.VideoCapture does not stall the loop.
+
+        Args:
+            frames (AsyncIterable or Iterable of np.ndarray): The frames to scan.
+            max_pending (int): Number of result lists held for a slow consumer.
+                               When it is exceeded the oldest list is dropped.
+            normalize (bool): If False, only detect boundaries, without the
+                              per-frame warp.
+
+        Yields:
+            List[DocumentResult]: The documents found in one frame, with
+                                  normalized_image set unless normalize is False.
+
+        Raises:
+            RuntimeError: If another stream() is already running on this scanner.
+            CaptureError: If the SDK refused to start capturing.
+        """
+        if self._streaming:
+            raise RuntimeError("AsyncDocumentScanner.stream() is already running")
+        self._streaming = True
+
+        loop = asyncio.get_running_loop()
+        queue: "asyncio.Queue[Any]" = asyncio.Queue()
+        fetcher = self.scanner.fetcher
+        processed_before = fetcher.processed
+        # Result lists that reached the loop, and how many the SDK delivered,
+        # known once the feeder is done and no frame is pending.
+        state: Dict[str, Any] = {"delivered": 0, "expected": None, "ended": False}
+
+        def end(item: Any = _DONE) -> None:
+            # Runs on the event loop. Nothing is queued after the sentinel, so
+            # the max_pending trimming can never drop it.
+            if not state["ended"]:
+                state["ended"] = True
+                queue.put_nowait(item)
+
+        def deliver(results: Any) -> None:
+            # Runs on the event loop.
+            if state["ended"]:
+                return
+            state["delivered"] += 1
+            if queue.qsize() >= max_pending:
+                queue.get_nowait()
+            queue.put_nowait(results)
+            if state["expected"] is not None and state["delivered"] >= state["expected"]:
+                end()
+
+        def listener(results: List[DocumentResult]) -> None:
+            # Runs on an SDK thread, once for every frame that is not dropped.
+            loop.call_soon_threadsafe(deliver, results)
+
+        async def feed() -> None:
+            if hasattr(frames, "__aiter__"):
+                async for frame in frames:
+                    await self._run(self.scanner.detectMatAsync, frame)
+            else:
+                iterator = iter(frames)
+                while True:
+                    frame = await self._run(next, iterator, _DONE)
+                    if frame is _DONE:
+                        break
+                    await self._run(self.scanner.detectMatAsync, frame)
+            # Wait on a helper thread, so that clearAsyncListener() can still
+            # run on the executor and wake it up.
+            await loop.run_in_executor(None, fetcher.wait_idle)
+            # Every processed frame has called the listener by now, but its
+            # result may still be on its way to the loop.
+            state["expected"] = fetcher.processed - processed_before
+            if state["delivered"] >= state["expected"]:
+                end()
+
+        def on_fed(task: "asyncio.Future[None]") -> None:
+            if not task.cancelled() and task.exception() is not None:
+                end(task.exception())
+
+        error_code, error_message = await self._run(self.scanner._start_listener, listener, normalize)
+        if error_code != EnumErrorCode.EC_OK:
+            await self._run(self.scanner.clearAsyncListener)
+            self._streaming = False
+            raise CaptureError(error_code, error_message)
+        self._end_stream = lambda: loop.call_soon_threadsafe(end)
+        feeder = asyncio.ensure_future(feed())
+        feeder.add_done_callback(on_fed)
+        try:
+            while True:
+                results = await queue.get()
+                if results is _DONE:
+                    return
+                if isinstance(results, Exception):
+                    raise results
+                yield results
+        finally:
+            self._end_stream = None
+            feeder.cancel()
+            await asyncio.gather(feeder, return_exceptions=True)
+            # The default executor, because aclose() may have shut ours down.
+            await loop.run_in_executor(None, self.scanner.clearAsyncListener)
+            self._streaming = False
@@ -0,0 +1,398 @@
+"""
+Benchmark suite with a synthetic document generator.
+
+synthetic_scene() renders a document page, warped by a random homography,
+onto a cluttered background, and returns the ground-truth corners with it.
+run() times the main operations on such scenes at several resolutions
+and reports latency percentiles and throughput as a JSON-ready dict, so
+that runs on different machines, versions or settings can be compared.
+
+Usage:
+    scandocument bench [--scenes 720p 1080p] [--iterations 20] [--output run.json]
+    scandocument bench --compare baseline.json --output run.json
+
+Example:
+    from docscanner import bench
+
+    report = bench.run(docscanner.createInstance(), scenes=["1080p"], iterations=10)
+    print(report["results"][0]["p95_ms"])
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+import docscanner
+from . import (
+    BLOCK,
+    DocumentResult,
+    DocumentScanner,
+    EnumImageColourMode,
+    convertMat2ImageData,
+    convertNormalizedImage2Mat,
+)
+
+# Scene sizes as (width, height). A4 at 600 dpi is 210 x 297 mm.
+SCENES: Dict[str, Tuple[int, int]] = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+    "a4-600dpi": (4961, 7016),
+}
+
+CASES = ("detect", "normalize", "convert_mat", "convert_normalized", "async")
+
+_WORDS = ("invoice", "total", "amount", "date", "account", "payment", "receipt", "number",
+          "address", "signature", "document", "page", "reference", "balance", "tax")
+
+
+def synthetic_page(width: int = 1240, height: int = 1754, seed: int = 0) -> np.ndarray:
+    """
+    Render a text-like document page: a header, lines of words and a table.
+
+    Args:
+        width (int): Page width in pixels.
+        height (int): Page height in pixels.
+        seed (int): Seed of the random layout.
+
+    Returns:
+        numpy.ndarray: A BGR page image.
+    """
+    rng = np.random.default_rng(seed)
+    page = np.full((height, width, 3), 245, dtype=np.uint8)
+    margin = width // 12
+    scale = width / 1240
+    cv2.rectangle(page, (margin, margin), (width - margin, margin + int(90 * scale)), (60, 60, 60), -1)
+    y = margin + int(160 * scale)
+    line_height = int(38 * scale)
+    while y < height * 0.7:
+        x = margin
+        while True:
+            word = _WORDS[rng.integers(len(_WORDS))]
+            (text_width, _), _ = cv2.getTextSize(word, cv2.FONT_HERSHEY_SIMPLEX, scale, 2)
+            if x + text_width > width - margin:
+                break
+            cv2.putText(page, word, (x, y), cv2.FONT_HERSHEY_SIMPLEX, scale, (30, 30, 30), 2, cv2.LINE_AA)
+            x += text_width + int(16 * scale)
+        y += line_height
+    for row in range(6):
+        top = int(height * 0.74) + row * line_height
+        cv2.rectangle(page, (margin, top), (width - margin, top + line_height), (90, 90, 90), 2)
+    return page
+
+
+def synthetic_scene(width: int, height: int, seed: int = 0,
+                    document: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Warp a document onto a cluttered background with a random homography.
+
+    The document covers roughly 25 to 50 percent of the scene, with random
+    rotation, perspective and position.
+
+    Args:
+        width (int): Scene width in pixels.
+        height (int): Scene height in pixels.
+        seed (int): Seed of the background, pose and page layout.
+        document (numpy.ndarray, optional): The page to place. Defaults to
+                                            synthetic_page().
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: The BGR scene and the (4, 2)
+        float32 corners of the document in it, clockwise from top-left.
+    """
+    rng = np.random.default_rng(seed)
+    if document is None:
+        document = synthetic_page(seed=seed)
+
+    # Cluttered background: blurred noise under random shapes and lines.
+    small = rng.integers(40, 200, (max(height // 16, 1), max(width // 16, 1), 3), dtype=np.uint8)
+    scene = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+    unit = min(width, height)
+    for _ in range(40):
+        colour = tuple(int(c) for c in rng.integers(0, 256, 3))
+        center = (int(rng.integers(width)), int(rng.integers(height)))
+        size = int(rng.integers(unit // 40, unit // 8))
+        shape = rng.integers(3)
+        if shape == 0:
+            cv2.circle(scene, center, size, colour, -1)
+        elif shape == 1:
+            cv2.rectangle(scene, center, (center[0] + size, center[1] + size // 2), colour, -1)
+        else:
+            end = (int(rng.integers(width)), int(rng.integers(height)))
+            cv2.line(scene, center, end, colour, max(1, unit // 300))
+
+    # Target quad: an upright rectangle of the page's aspect ratio, rotated
+    # and with each corner jittered for perspective.
+    page_height, page_width = document.shape[:2]
+    area = rng.uniform(0.25, 0.5) * width * height
+    quad_height = min(np.sqrt(area * page_height / page_width), height * 0.85)
+    quad_width = min(quad_height * page_width / page_height, width * 0.85)
+    quad_height = quad_width * page_height / page_width
+    corners = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], dtype=np.float32) * [quad_width / 2, quad_height / 2]
+    angle = np.deg2rad(rng.uniform(-12, 12))
+    rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]], dtype=np.float32)
+    corners = corners @ rotation.T
+    corners += rng.uniform(-0.06, 0.06, (4, 2)).astype(np.float32) * [quad_width, quad_height]
+    low = -corners.min(axis=0) + 0.02 * unit
+    high = np.array([width, height], dtype=np.float32) - corners.max(axis=0) - 0.02 * unit
+    corners += rng.uniform(np.minimum(low, high), np.maximum(low, high)).astype(np.float32)
+    corners = corners.astype(np.float32)
+
+    source = np.array([[0, 0], [page_width, 0], [page_width, page_height], [0, page_height]], dtype=np.float32)
+    homography = cv2.getPerspectiveTransform(source, corners)
+    cv2.warpPerspective(document, homography, (width, height), scene, flags=cv2.INTER_LINEAR,
+                        borderMode=cv2.BORDER_TRANSPARENT)
+    return scene, corners
+
+
+def summarize(durations_ns: List[int]) -> Dict[str, float]:
+    """
+    Reduce a list of call durations to latency percentiles and throughput.
+
+    Args:
+        durations_ns (List[int]): Duration of each call in nanoseconds.
+
+    Returns:
+        dict: count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms and per_second.
+    """
+    samples = np.asarray(durations_ns, dtype=np.float64) / 1e6
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "count": int(samples.size),
+        "mean_ms": round(float(samples.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(samples.max()), 3),
+        "per_second": round(1000.0 / float(samples.mean()), 2) if samples.mean() > 0 else 0.0,
+    }
+
+
+def measure(func: Callable[[], Any], iterations: int, warmup: int = 1) -> List[int]:
+    """Call func warmup times, then iterations times, and return each timed duration in nanoseconds."""
+    for _ in range(warmup):
+        func()
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        func()
+        durations.append(time.perf_counter_ns() - start)
+    return durations
+
+
+def measure_async(scanner: DocumentScanner, image: np.ndarray, iterations: int) -> Tuple[List[int], float]:
+    """
+    Time the async listener path: detectMatAsync() to listener call, per frame.
+
+    The frames go through a private scanner with the same detection_max_side
+    and a one-frame BLOCK buffer, so the caller's frame buffer settings are
+    left alone. With a single waiting frame, every frame is processed, in
+    the order it was submitted, and the producer runs just ahead of detection.
+    A frame's latency starts when detectMatAsync() is called for it, so it
+    includes the wait for room in the buffer.
+
+    Returns:
+        Tuple[List[int], float]: Per-frame latencies in nanoseconds, whether or
+        not a document was found, and frames per second over the whole run.
+    """
+    async_scanner = DocumentScanner(pool_size=1, frame_buffer_size=1, frame_overflow=BLOCK,
+                                    detection_max_side=scanner.detection_max_side)
+    # Frames come back in submission order, so the i-th listener call
+    # belongs to the i-th frame, whose frame id in the private scanner is i.
+    submitted: List[int] = []
+    delivered: List[int] = []
+    done = threading.Event()
+
+    def listener(results: List[DocumentResult]) -> None:
+        # Called once for every processed frame, including frames without a document.
+        delivered.append(time.perf_counter_ns())
+        stats = async_scanner.fetcher.stats()
+        if stats["processed"] + stats["dropped"] >= iterations:
+            done.set()
+
+    if not async_scanner.addAsyncListener(listener, normalize=False):
+        async_scanner.clearAsyncListener()
+        return [], 0.0
+    start = time.perf_counter()
+    try:
+        for _ in range(iterations):
+            # Stamped before submitting: the listener may run for this frame
+            # before detectMatAsync() returns.
+            submitted.append(time.perf_counter_ns())
+            async_scanner.detectMatAsync(image)
+        done.wait(timeout=60)
+    finally:
+        elapsed = time.perf_counter() - start
+        async_scanner.clearAsyncListener()
+    latencies = [end - begin for begin, end in zip(submitted, delivered)]
+    return latencies, iterations / elapsed if elapsed > 0 else 0.0
+
+
+def run(scanner: Optional[DocumentScanner] = None, scenes: Iterable[str] = tuple(SCENES),
+        cases: Iterable[str] = CASES, iterations: int = 20, seed: int = 0,
+        document: Optional[np.ndarray] = None, log: Optional[Callable[[str], None]] = print) -> Dict[str, Any]:
+    """
+    Benchmark detection, normalization, conversions and the async path on synthetic scenes.
+
+    Args:
+        scanner (DocumentScanner, optional): The scanner to measure. Defaults to
+                                             a new one with a single router.
+        scenes (Iterable[str]): Names from SCENES.
+        cases (Iterable[str]): Names from CASES.
+        iterations (int): Timed calls per case and scene.
+        seed (int): Seed of the synthetic scenes.
+        document (numpy.ndarray, optional): Page image to use instead of the
+                                            synthetic page.
+        log (callable, optional): Receives one line per measurement. None is silent.
+
+    Returns:
+        dict: "meta" describing the machine and versions, and "results", a
+        list of summarize() dicts tagged with their scene and case. Detection
+        entries also carry "found", the fraction of scenes whose document was
+        detected with a corner within 5% of the scene size of the truth.
+    """
+    if scanner is None:
+        scanner = DocumentScanner(pool_size=1)
+    results: List[Dict[str, Any]] = []
+
+    def record(scene: str, case: str, durations: List[int], **extra: Any) -> None:
+        if not durations:
+            return
+        entry = {"scene": scene, "case": case, **summarize(durations), **extra}
+        results.append(entry)
+        if log is not None:
+            log("{:10s} {:18s} p50 {:9.2f} ms  p95 {:9.2f} ms  p99 {:9.2f} ms  {:8.2f}/s".format(
+                scene, case, entry["p50_ms"], entry["p95_ms"], entry["p99_ms"], entry["per_second"]))
+
+    for name in scenes:
+        width, height = SCENES[name]
+        image, truth = synthetic_scene(width, height, seed, document)
+
+        if "detect" in cases:
+            found = scanner.detect(image)
+            tolerance = 0.05 * max(width, height)
+            hit = any(np.abs(result.quad - truth).max() <= tolerance for result in found)
+            record(name, "detect", measure(lambda: scanner.detect(image), iterations), found=float(hit))
+
+        if "normalize" in cases:
+            document_result = DocumentResult(quad=truth)
+            document_result.source = image
+            record(name, "normalize", measure(
+                lambda: scanner.normalize(document_result, EnumImageColourMode.ICM_COLOUR), iterations))
+
+        if "convert_mat" in cases:
+            record(name, "convert_mat", measure(lambda: convertMat2ImageData(image), iterations))
+
+        if "convert_normalized" in cases:
+            image_data = convertMat2ImageData(image)
+            record(name, "convert_normalized", measure(
+                lambda: convertNormalizedImage2Mat(image_data, copy=True), iterations))
+
+        if "async" in cases:
+            latencies, fps = measure_async(scanner, image, iterations)
+            record(name, "async", latencies, frames_per_second=round(fps, 2))
+
+    meta = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "sdk_version": docscanner.__version__,
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "pool_size": scanner.pool.size,
+        "iterations": iterations,
+        "seed": seed,
+    }
+    return {"meta": meta, "results": results}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Pair the results of two runs and compute their p50 and p95 ratios.
+
+    Args:
+        baseline (dict): A report returned by run() or loaded from its JSON.
+        current (dict): The report to compare against baseline.
+
+    Returns:
+        List[dict]: For each scene and case present in both, the baseline and
+        current p50/p95 and the current/baseline ratios. Ratios above 1 are slower.
+    """
+    previous = {(entry["scene"], entry["case"]): entry for entry in baseline["results"]}
+    rows = []
+    for entry in current["results"]:
+        old = previous.get((entry["scene"], entry["case"]))
+        if old is None:
+            continue
+        rows.append({
+            "scene": entry["scene"],
+            "case": entry["case"],
+            "baseline_p50_ms": old["p50_ms"],
+            "p50_ms": entry["p50_ms"],
+            "p50_ratio": round(entry["p50_ms"] / old["p50_ms"], 3) if old["p50_ms"] else None,
+            "baseline_p95_ms": old["p95_ms"],
+            "p95_ms": entry["p95_ms"],
+            "p95_ratio": round(entry["p95_ms"] / old["p95_ms"], 3) if old["p95_ms"] else None,
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of ``scandocument bench``."""
+    parser = argparse.ArgumentParser(prog="scandocument bench",
+                                     description="Benchmark docscanner on synthetic document scenes")
+    parser.add_argument("--scenes", nargs="+", default=list(SCENES), choices=list(SCENES),
+                        help="Scene sizes to generate")
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES),
+                        help="Operations to measure")
+    parser.add_argument("--iterations", default=20, type=int, help="Timed calls per case and scene")
+    parser.add_argument("--seed", default=0, type=int, help="Seed of the synthetic scenes")
+    parser.add_argument("--document", help="Page image to warp instead of the synthetic page")
+    parser.add_argument("--pool-size", default=1, type=int, help="Router pool size of the scanner")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="A previous JSON report to compare against")
+    parser.add_argument("-l", "--license", default="", type=str, help="Set a valid license key")
+    args = parser.parse_args(argv)
+
+    docscanner.initLicense(args.license or
+                           "DLS2eyJoYW5kc2hha2VDb2RlIjoiMjAwMDAxLTE2NDk4Mjk3OTI2MzUiLCJvcmdhbml6YXRpb25JRCI6IjIwMDAwMSIsInNlc3Npb25QYXNzd29yZCI6IndTcGR6Vm05WDJrcEQ5YUoifQ==")
+    document = None
+    if args.document is not None:
+        document = cv2.imread(args.document)
+        if document is None:
+            print("Cannot read image:", args.document)
+            return 1
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    report = run(DocumentScanner(pool_size=args.pool_size), args.scenes, args.cases,
+                 args.iterations, args.seed, document)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+        print("Report written to", args.output)
+
+    if baseline is not None:
+        rows = compare(baseline, report)
+        print("scene      case                 p50 ratio  p95 ratio")
+        for row in rows:
+            print("{:10s} {:18s} {:>11} {:>10}".format(row["scene"], row["case"],
+                                                      str(row["p50_ratio"]), str(row["p95_ratio"])))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
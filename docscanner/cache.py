@@ -0,0 +1,111 @@
+"""
+Decoded-image cache for file sources.
+
+When a DocumentResult.source is a file path, every capture() reads and decodes
+the file again: once for detect() and once more for each normalize() call.
+SourceCache keeps recently decoded images in memory, bounded by their total
+size in bytes, so repeated captures from the same file reuse one decode.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from dynamsoft_capture_vision_bundle import EnumErrorCode, ImageData, ImageIO
+
+
+class SourceCache:
+    """
+    A thread-safe, byte-bounded LRU cache of decoded ImageData keyed by file path.
+
+    Entries are keyed by path, modification time and size, so a file that is
+    rewritten on disk is decoded again rather than served stale.
+
+    Attributes:
+        max_bytes (int): Upper bound on the total size of cached images.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that decoded the file.
+        evictions (int): Number of entries dropped to stay within max_bytes.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes (int): Maximum total size, in bytes, of the decoded images kept.
+        """
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._bytes: int = 0
+        self._entries: "OrderedDict[Tuple[str, int, int], Tuple[ImageData, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._io = ImageIO()
+
+    def get(self, path: str) -> Optional[ImageData]:
+        """
+        Return the decoded image for a file, decoding and caching it on a miss.
+
+        Args:
+            path (str): Path to the image file.
+
+        Returns:
+            ImageData or None: The decoded image, or None if the file cannot be read.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = (path, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        error_code, image = self._io.read_from_file(path)
+        if error_code != EnumErrorCode.EC_OK or image is None:
+            return None
+
+        size = image.get_stride() * image.get_height()
+        if size > self.max_bytes:
+            return image
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (image, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self._bytes -= evicted_size
+                    self.evictions += 1
+        return image
+
+    def clear(self) -> None:
+        """Drop every cached image. The counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: hits, misses, evictions, entries, bytes and max_bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,217 @@
+"""
+Pixel-format conversion between numpy arrays and the SDK's ImageData.
+
+This is the single place where docscanner and the examples turn OpenCV
+matrices into ImageData and SDK output back into matrices. All conversions
+are vectorized and honour row strides.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+from dynamsoft_capture_vision_bundle import EnumImagePixelFormat, ImageData
+
+_MAT_PIXEL_FORMATS = {
+    1: EnumImagePixelFormat.IPF_GRAYSCALED,
+    3: EnumImagePixelFormat.IPF_RGB_888,
+    4: EnumImagePixelFormat.IPF_ARGB_8888,
+}
+
+
+def _shared_bytes(mat: np.ndarray) -> Optional[Tuple[bytes, int]]:
+    """
+    Return the bytes object an array views, and its row stride, if it can be passed as-is.
+
+    This holds for arrays created with np.frombuffer() over a bytes object,
+    such as images unpacked from ImageData.get_bytes(), including row-padded
+    views of them, provided the view starts at the first byte of the buffer
+    and each row is contiguous.
+
+    Returns:
+        tuple or None: (buffer, stride), or None if a copy is required.
+    """
+    base = mat.base
+    while isinstance(base, np.ndarray):
+        base = base.base
+    if not isinstance(base, bytes) or mat.ndim not in (2, 3):
+        return None
+
+    height, width = mat.shape[:2]
+    channels = mat.shape[2] if mat.ndim == 3 else 1
+    stride = mat.strides[0]
+    if mat.strides[1] != channels or (mat.ndim == 3 and mat.strides[2] != 1) or stride < width * channels:
+        return None
+
+    start = mat.__array_interface__['data'][0]
+    if start != np.frombuffer(base, dtype=np.uint8).__array_interface__['data'][0]:
+        return None
+    if stride * height > len(base):
+        return None
+    return base, stride
+
+
+def convertMat2ImageData(mat: np.ndarray) -> ImageData:
+    """
+    Convert an OpenCV matrix to Dynamsoft ImageData format.
+    
+    This utility function handles the conversion between OpenCV's numpy
+    array format and the SDK's ImageData format, including proper
+    pixel format detection for RGB and grayscale images.
+    
+    Args:
+        mat (numpy.ndarray): OpenCV image matrix (RGB, BGR, BGRA or grayscale)
+                             with dtype uint8. Non-contiguous views such as
+                             ROI slices are supported.
+    
+    Returns:
+        ImageData: Converted image data ready for SDK processing.
+
+    Raises:
+        ValueError: If the dtype is not uint8 or the channel count is not 1, 3 or 4.
+    
+    Note:
+        - 3-channel images are treated as RGB_888
+        - 4-channel images are treated as ARGB_8888
+        - Single-channel images are treated as grayscale
+        - The ImageData constructor only accepts bytes and copies them into SDK
+          memory, so the array may be modified or freed as soon as this returns.
+        - Arrays that already view a bytes object (for example images unpacked
+          from ImageData.get_bytes()) are passed without any Python-side copy,
+          keeping their real row stride. Anything else costs exactly one copy,
+          which also compacts non-contiguous views.
+    """
+    if mat.dtype != np.uint8:
+        raise ValueError(f"Unsupported dtype {mat.dtype}, expected uint8")
+
+    height, width = mat.shape[:2]
+    channels = mat.shape[2] if mat.ndim == 3 else 1
+    pixel_format = _MAT_PIXEL_FORMATS.get(channels)
+    if mat.ndim not in (2, 3) or pixel_format is None:
+        raise ValueError(f"Unsupported image shape {mat.shape}")
+
+    shared = _shared_bytes(mat)
+    if shared is not None:
+        buffer, stride = shared
+    else:
+        # tobytes() gathers strided views into a compact buffer in a single pass.
+        buffer, stride = mat.tobytes(), width * channels
+    imagedata = ImageData(buffer, width, height, stride, pixel_format)
+    return imagedata
+
+
+def _unpack_binary(rows: np.ndarray, width: int, inverted: bool = False) -> np.ndarray:
+    """
+    Expand 1-bit packed rows (most significant bit first) into 0/255 pixels.
+
+    Args:
+        rows (numpy.ndarray): (height, stride) uint8 array of packed rows.
+        width (int): Number of pixels per row; padding bits past it are dropped.
+        inverted (bool): If True, set bits map to 0 and clear bits to 255.
+
+    Returns:
+        numpy.ndarray: (height, width) uint8 array.
+    """
+    bits = np.unpackbits(rows, axis=1, count=width)
+    if inverted:
+        np.bitwise_xor(bits, 1, out=bits)
+    return np.multiply(bits, 255, out=bits)
+
+
+def _is_packed_binary(pixel_format: int, width: int, height: int, stride: int, size: int) -> bool:
+    """
+    Tell 1-bit packed rows from one-byte-per-pixel rows of a binary image.
+
+    BINARY and BINARYINVERTED rows hold ceil(width / 8) bytes plus alignment
+    padding, but some images labelled with them store one byte per pixel.
+    Those need a stride of at least width bytes, and a buffer that holds
+    width bytes of the last row. Images where both layouts fit, such as
+    narrow ones whose padded packed rows are as wide as the image, are read
+    as one byte per pixel.
+
+    Args:
+        pixel_format (int): The image's EnumImagePixelFormat.
+        width (int): Pixels per row.
+        height (int): Number of rows.
+        stride (int): Bytes per row.
+        size (int): Length of the image's bytes.
+
+    Returns:
+        bool: True if the rows are 1-bit packed.
+    """
+    if pixel_format not in (EnumImagePixelFormat.IPF_BINARY, EnumImagePixelFormat.IPF_BINARYINVERTED):
+        return False
+    return stride < width or size < (height - 1) * stride + width
+
+
+_GRAY_PIXEL_FORMATS = (
+    EnumImagePixelFormat.IPF_GRAYSCALED,
+    EnumImagePixelFormat.IPF_BINARY_8,
+)
+_PACKED_PIXEL_CHANNELS = {
+    EnumImagePixelFormat.IPF_RGB_888: 3,
+    EnumImagePixelFormat.IPF_BGR_888: 3,
+    EnumImagePixelFormat.IPF_ARGB_8888: 4,
+    EnumImagePixelFormat.IPF_ABGR_8888: 4,
+}
+
+
+def convertNormalizedImage2Mat(normalized_image: ImageData, copy: bool = False) -> np.ndarray:
+    """
+    Convert a Dynamsoft ImageData object to an OpenCV-compatible numpy array.
+    
+    This utility function handles the conversion from the SDK's ImageData format
+    back to OpenCV's numpy array format, supporting various pixel formats including
+    binary, grayscale, and color images.
+    
+    Args:
+        normalized_image (ImageData): The ImageData object from SDK normalization results
+        copy (bool): If False (the default), 8-bit formats are returned as read-only
+                     views over the bytes returned by get_bytes(), with no further
+                     allocation. If True, the result is always a compact, writable
+                     array that owns its memory.
+        
+    Returns:
+        numpy.ndarray: OpenCV-compatible image matrix
+        
+    Supported Formats:
+        - GRAYSCALED, BINARY_8: Single channel 8-bit view
+        - BINARY_8_INVERTED: Single channel 8-bit, inverted back to 0=black
+        - BINARY, BINARYINVERTED: 1-bit packed rows unpacked to 0/255
+          (BINARY images stored one byte per pixel are returned as views)
+        - RGB_888, BGR_888: 3-channel view, channel order as stored
+        - ARGB_8888, ABGR_8888: 4-channel view, channel order as stored
+
+    Raises:
+        ValueError: For any other pixel format.
+        
+    Note:
+        Row padding is honoured through get_stride(), so padded images are
+        returned as strided views rather than reshaped garbage. The 1-bit and
+        inverted formats always allocate a new array.
+    """
+    image_bytes = normalized_image.get_bytes()
+    width = normalized_image.get_width()
+    height = normalized_image.get_height()
+    stride = normalized_image.get_stride()
+    pixel_format = normalized_image.get_image_pixel_format()
+
+    if _is_packed_binary(pixel_format, width, height, stride, len(image_bytes)):
+        rows = np.ndarray((height, stride), dtype=np.uint8, buffer=image_bytes)
+        return _unpack_binary(rows, width, pixel_format == EnumImagePixelFormat.IPF_BINARYINVERTED)
+
+    # From here on, binary rows hold one byte per pixel.
+    if pixel_format in _GRAY_PIXEL_FORMATS or pixel_format == EnumImagePixelFormat.IPF_BINARY:
+        mat = np.ndarray((height, width), dtype=np.uint8, buffer=image_bytes, strides=(stride, 1))
+    elif pixel_format in (EnumImagePixelFormat.IPF_BINARY_8_INVERTED, EnumImagePixelFormat.IPF_BINARYINVERTED):
+        rows = np.ndarray((height, width), dtype=np.uint8, buffer=image_bytes, strides=(stride, 1))
+        return np.subtract(255, rows, dtype=np.uint8)
+    elif pixel_format in _PACKED_PIXEL_CHANNELS:
+        channels = _PACKED_PIXEL_CHANNELS[pixel_format]
+        mat = np.ndarray((height, width, channels), dtype=np.uint8, buffer=image_bytes,
+                         strides=(stride, channels, 1))
+    else:
+        raise ValueError(f"Unsupported pixel format {pixel_format}")
+
+    if copy:
+        return np.array(mat)
+    return mat
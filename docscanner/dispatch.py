@@ -0,0 +1,192 @@
+"""
+Delivery policies for async listener results.
+
+By default the async listener runs on the SDK's callback thread, so a slow
+listener (drawing, network publishing) holds up the capture pipeline.
+LatestDispatcher moves listener calls onto an executor thread. It keeps a
+single-slot mailbox: while the listener is busy, a newer result replaces
+the one still waiting, so the listener always sees the most recent frame
+and latency cannot build up.
+
+ChangeFilter drops results whose quads barely moved since the last result
+it passed on, so a steady scene does not trigger a callback per frame.
+"""
+
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .geometry import corner_shifts, match_quads, quad_ious, stack_quads
+
+
+class LatestDispatcher:
+    """
+    Run a listener on an executor, keeping only the newest undelivered result.
+
+    The listener is never called concurrently with itself, even if the
+    executor has several threads.
+
+    Attributes:
+        delivered (int): Results passed to the listener.
+        coalesced (int): Results replaced by a newer one before delivery.
+    """
+
+    def __init__(self, listener: Callable[[Any], None], executor: Optional[Executor] = None) -> None:
+        """
+        Initialize the dispatcher.
+
+        Args:
+            listener (callable): The function to call with each delivered result.
+            executor (Executor, optional): Where the listener runs. Defaults to a
+                                           private single-thread executor.
+        """
+        self.listener = listener
+        self.delivered: int = 0
+        self.coalesced: int = 0
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1,
+                                                        thread_name_prefix="docscanner-listener")
+        self._lock = threading.Lock()
+        self._mail: Any = None
+        self._has_mail = False
+        self._scheduled = False
+        self._closed = False
+
+    def submit(self, result: Any) -> None:
+        """
+        Post a result for delivery. Called on the SDK's callback thread.
+
+        Args:
+            result: The value to pass to the listener.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            if self._has_mail:
+                self.coalesced += 1
+            self._mail = result
+            self._has_mail = True
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._executor.submit(self._drain)
+
+    def _drain(self) -> None:
+        """Deliver mail until the mailbox is empty."""
+        while True:
+            with self._lock:
+                if not self._has_mail or self._closed:
+                    self._scheduled = False
+                    return
+                result = self._mail
+                self._mail = None
+                self._has_mail = False
+            try:
+                self.listener(result)
+            except Exception as err:
+                print("Error in listener:", err)
+            with self._lock:
+                self.delivered += 1
+
+    def close(self) -> None:
+        """Discard any waiting result and stop accepting new ones. A running listener call finishes."""
+        with self._lock:
+            self._closed = True
+            self._mail = None
+            self._has_mail = False
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the dispatch counters.
+
+        Returns:
+            dict: delivered and coalesced.
+        """
+        with self._lock:
+            return {"delivered": self.delivered, "coalesced": self.coalesced}
+
+
+class ChangeFilter:
+    """
+    Pass a list of results to the listener only when the quads changed.
+
+    Results are compared with the last list that was passed on. A change in
+    the number of documents, including the "lost" (some to none) and "found"
+    (none to some) transitions, is always passed on. Otherwise each quad is
+    paired with the nearest previous one, and the list is suppressed unless
+    some quad moved by at least min_change pixels at a corner and, when
+    min_iou is set, also overlaps its previous position by less than min_iou.
+
+    Attributes:
+        delivered (int): Result lists passed to the listener.
+        suppressed (int): Result lists dropped as unchanged.
+    """
+
+    def __init__(self, listener: Callable[[List[Any]], None], min_change: float = 1.0,
+                 min_iou: Optional[float] = None) -> None:
+        """
+        Initialize the filter.
+
+        Args:
+            listener (callable): The function to call with changed result lists.
+            min_change (float): Smallest corner movement, in pixels, that counts
+                                as a change.
+            min_iou (float, optional): If set, a quad whose IoU with its previous
+                                       position is at least this value counts as
+                                       unchanged, however far its corners moved.
+        """
+        self.listener = listener
+        self.min_change: float = min_change
+        self.min_iou: Optional[float] = min_iou
+        self.delivered: int = 0
+        self.suppressed: int = 0
+        self._last: Optional[np.ndarray] = None
+        # The tracker calls in from the frame producer's thread as well.
+        self._lock = threading.Lock()
+
+    def changed(self, quads: np.ndarray) -> bool:
+        """
+        Decide whether quads differ enough from the last delivered ones.
+
+        Args:
+            quads (numpy.ndarray): (N, 4, 2) corners of the current results.
+
+        Returns:
+            bool: True if the results should be delivered.
+        """
+        if self._last is None:
+            return True
+        order = match_quads(self._last, quads)
+        if order is None:
+            return True
+        if len(quads) == 0:
+            return False
+        previous = self._last[order]
+        moved = corner_shifts(previous, quads) >= self.min_change
+        if self.min_iou is not None and moved.any():
+            moved &= quad_ious(previous[moved], quads[moved]) < self.min_iou
+        return bool(moved.any())
+
+    def __call__(self, results: List[Any]) -> None:
+        quads = stack_quads(results)
+        with self._lock:
+            if not self.changed(quads):
+                self.suppressed += 1
+                return
+            self._last = quads
+            self.delivered += 1
+        self.listener(results)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the filter counters.
+
+        Returns:
+            dict: delivered and suppressed.
+        """
+        with self._lock:
+            return {"delivered": self.delivered, "suppressed": self.suppressed}
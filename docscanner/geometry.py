@@ -0,0 +1,182 @@
+"""
+Vectorized geometry over document quads.
+
+Helpers here operate on many DocumentResult corners at once, using the
+(4, 2) float32 quad each result carries.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+QUAD_RECORD_DTYPE = np.dtype([
+    ('x1', np.float32), ('y1', np.float32),
+    ('x2', np.float32), ('y2', np.float32),
+    ('x3', np.float32), ('y3', np.float32),
+    ('x4', np.float32), ('y4', np.float32),
+])
+
+# Index of the next corner, walking around a quad.
+_NEXT = np.array([1, 2, 3, 0])
+
+
+def stack_quads(results: Sequence) -> np.ndarray:
+    """
+    Stack the quads of several results into one array.
+
+    Args:
+        results (Sequence[DocumentResult]): The detected documents.
+
+    Returns:
+        numpy.ndarray: (N, 4, 2) float32 array of corners.
+    """
+    if len(results) == 0:
+        return np.empty((0, 4, 2), dtype=np.float32)
+    return np.stack([result.quad for result in results]).astype(np.float32, copy=False)
+
+
+def quads_to_records(results: Sequence) -> np.ndarray:
+    """
+    Export the corners of several results as a structured array.
+
+    Args:
+        results (Sequence[DocumentResult]): The detected documents.
+
+    Returns:
+        numpy.ndarray: (N,) array with float32 fields x1, y1, ... x4, y4.
+    """
+    return stack_quads(results).reshape(-1, 8).copy().view(QUAD_RECORD_DTYPE).reshape(-1)
+
+
+def quad_areas(quads: np.ndarray) -> np.ndarray:
+    """
+    Signed shoelace areas of many quads.
+
+    Args:
+        quads (numpy.ndarray): (N, 4, 2) corners.
+
+    Returns:
+        numpy.ndarray: (N,) areas, positive for counter-clockwise corners in
+        x-right/y-up axes, which is clockwise on screen.
+    """
+    x = quads[..., 0]
+    y = quads[..., 1]
+    return 0.5 * np.sum(x * y[..., _NEXT] - x[..., _NEXT] * y, axis=-1)
+
+
+def _cross(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def _clipped_edge_area(a: np.ndarray, b: np.ndarray, strict: bool) -> np.ndarray:
+    """
+    Sum, per pair, the boundary integral of the parts of a's edges inside b.
+
+    Each edge of a is clipped against the four half-planes of b (Cyrus-Beck),
+    and cross(start, end) / 2 of the surviving segment is accumulated. Adding
+    the result for (a, b) and (b, a) gives the intersection area of convex
+    quads, by Green's theorem.
+    """
+    start = a                                    # (N, 4, 2) edge starts
+    direction = a[:, _NEXT] - a                  # (N, 4, 2) edge vectors
+    origin = b[:, None, :, :]                    # (N, 1, 4, 2) half-plane points
+    normal = (b[:, _NEXT] - b)[:, None, :, :]
+
+    # Inside b means cross(normal, point - origin) >= 0 for all four half-planes.
+    offset = _cross(normal, start[:, :, None, :] - origin)       # (N, 4, 4)
+    rate = _cross(normal, direction[:, :, None, :])              # (N, 4, 4)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing = -offset / rate
+    t0 = np.max(np.where(rate > 0, crossing, 0.0), axis=2)
+    t1 = np.min(np.where(rate < 0, crossing, 1.0), axis=2)
+    # An edge parallel to a half-plane boundary is outside when on its wrong
+    # side. Edges lying on the boundary are kept only when they run the same
+    # way as it, and only in the non-strict pass, so that an edge shared by
+    # both quads is counted once, and opposite shared edges are not counted.
+    on_boundary = offset == 0
+    if not strict:
+        on_boundary &= np.sum(normal * direction[:, :, None, :], axis=-1) < 0
+    outside = (rate == 0) & ((offset < 0) | on_boundary)
+    valid = (t1 > t0) & ~np.any(outside, axis=2)
+
+    p0 = start + t0[..., None] * direction
+    p1 = start + t1[..., None] * direction
+    return 0.5 * np.sum(np.where(valid, _cross(p0, p1), 0.0), axis=1)
+
+
+def quad_ious(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Intersection over union of pairs of convex quads, vectorized.
+
+    Args:
+        a (numpy.ndarray): (N, 4, 2) corners.
+        b (numpy.ndarray): (N, 4, 2) corners, paired with a.
+
+    Returns:
+        numpy.ndarray: (N,) IoU values, 0.0 for disjoint or empty quads.
+    """
+    a = np.asarray(a, dtype=np.float64).reshape(-1, 4, 2)
+    b = np.asarray(b, dtype=np.float64).reshape(-1, 4, 2)
+    area_a = quad_areas(a)
+    area_b = quad_areas(b)
+    # Orient every quad the same way so that "inside" is left of each edge.
+    a = np.where((area_a < 0)[:, None, None], a[:, ::-1], a)
+    b = np.where((area_b < 0)[:, None, None], b[:, ::-1], b)
+    area_a = np.abs(area_a)
+    area_b = np.abs(area_b)
+
+    intersection = _clipped_edge_area(a, b, strict=False) + _clipped_edge_area(b, a, strict=True)
+    union = area_a + area_b - intersection
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(union > 0, intersection / union, 0.0)
+
+
+def quad_iou(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Intersection over union of two convex quads.
+
+    Args:
+        a (numpy.ndarray): (4, 2) corners of the first quad.
+        b (numpy.ndarray): (4, 2) corners of the second quad.
+
+    Returns:
+        float: Overlap area divided by union area, 0.0 for disjoint or empty quads.
+    """
+    return float(quad_ious(a, b)[0])
+
+
+def corner_shifts(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Largest corner displacement of pairs of quads.
+
+    Args:
+        a (numpy.ndarray): (N, 4, 2) corners.
+        b (numpy.ndarray): (N, 4, 2) corners, paired with a.
+
+    Returns:
+        numpy.ndarray: (N,) maximum distance, in pixels, between matching corners.
+    """
+    return np.max(np.linalg.norm(np.asarray(a, dtype=np.float32) - np.asarray(b, dtype=np.float32), axis=-1), axis=-1)
+
+
+def match_quads(previous: np.ndarray, current: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Pair each current quad with the previous quad whose centre is nearest.
+
+    Args:
+        previous (numpy.ndarray): (N, 4, 2) corners.
+        current (numpy.ndarray): (M, 4, 2) corners.
+
+    Returns:
+        numpy.ndarray or None: (M,) indices into previous, or None if the counts
+        differ or two current quads pick the same previous one.
+    """
+    if len(previous) != len(current):
+        return None
+    if len(current) == 0:
+        return np.empty(0, dtype=np.intp)
+    distances = np.linalg.norm(current.mean(axis=1)[:, None, :] - previous.mean(axis=1)[None, :, :], axis=-1)
+    order = np.argmin(distances, axis=1)
+    if len(np.unique(order)) != len(order):
+        return None
+    return order
@@ -0,0 +1,211 @@
+"""
+Opt-in per-stage timing for DocumentScanner.
+
+A detect() or normalize() call is several steps with very different costs:
+converting the numpy array to ImageData, the SDK capture itself, building
+Python results from the captured items, and for normalize() pushing the
+ROI into the template settings. Instrumentation records how long each step
+took, how many bytes it copied and how often it ran, keeping a log2
+histogram of durations per stage, and passes every measurement to optional
+hooks for the caller's own telemetry.
+
+The scanner holds None instead of an Instrumentation while timing is off,
+so an uninstrumented call pays one attribute check per stage.
+
+Example:
+    scanner = createInstance(instrument=True)
+    scanner.add_stage_hook(lambda name, ns: metrics.observe(name, ns / 1e6))
+    scanner.detect(image)
+    print(scanner.stats()["stages"]["detect.capture"]["p50_ms"])
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Called as on_stage_end(name, ns) after each measured stage.
+StageHook = Callable[[str, int], None]
+
+# Bucket 0 counts durations under 2**_FIRST_SHIFT ns (about 1 us), and
+# bucket i durations under 2**(_FIRST_SHIFT + i) ns. The last bucket is open.
+_FIRST_SHIFT = 10
+_BUCKETS = 25
+
+
+class StageStats:
+    """
+    Counters and duration histogram of one stage.
+
+    Attributes:
+        calls (int): Number of measurements.
+        total_ns (int): Sum of the durations.
+        min_ns (int): Shortest duration.
+        max_ns (int): Longest duration.
+        bytes (int): Bytes copied by the stage, summed over all calls.
+        buckets (list): Number of durations per log2 bucket.
+    """
+
+    __slots__ = ("calls", "total_ns", "min_ns", "max_ns", "bytes", "buckets")
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.total_ns: int = 0
+        self.min_ns: int = 0
+        self.max_ns: int = 0
+        self.bytes: int = 0
+        self.buckets: List[int] = [0] * _BUCKETS
+
+    def add(self, ns: int, nbytes: int = 0) -> None:
+        """Count one measurement."""
+        if self.calls == 0 or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.calls += 1
+        self.total_ns += ns
+        self.bytes += nbytes
+        self.buckets[min(max(ns.bit_length() - _FIRST_SHIFT, 0), _BUCKETS - 1)] += 1
+
+    def percentile(self, q: float) -> int:
+        """
+        Estimate a duration percentile from the histogram.
+
+        Args:
+            q (float): The percentile, between 0 and 100.
+
+        Returns:
+            int: Upper bound in nanoseconds of the bucket holding the percentile,
+                 capped at the longest duration seen. 0 without measurements.
+        """
+        if self.calls == 0:
+            return 0
+        rank = q / 100.0 * self.calls
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(1 << (_FIRST_SHIFT + index), self.max_ns)
+        return self.max_ns
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the counters in milliseconds.
+
+        Returns:
+            dict: calls, total_ms, mean_ms, min_ms, max_ms, p50_ms, p90_ms,
+                  p99_ms, bytes, and histogram, which maps the upper bound of
+                  each non-empty bucket in microseconds to its count.
+        """
+        histogram = {}
+        for index, count in enumerate(self.buckets):
+            if count:
+                bound = float("inf") if index == _BUCKETS - 1 else (1 << (_FIRST_SHIFT + index)) / 1e3
+                histogram[bound] = count
+        return {
+            "calls": self.calls,
+            "total_ms": self.total_ns / 1e6,
+            "mean_ms": self.total_ns / self.calls / 1e6 if self.calls else 0.0,
+            "min_ms": self.min_ns / 1e6,
+            "max_ms": self.max_ns / 1e6,
+            "p50_ms": self.percentile(50) / 1e6,
+            "p90_ms": self.percentile(90) / 1e6,
+            "p99_ms": self.percentile(99) / 1e6,
+            "bytes": self.bytes,
+            "histogram": histogram,
+        }
+
+
+class Instrumentation:
+    """
+    Thread-safe collection of per-stage measurements.
+
+    Hooks run on the thread that finished the stage, after the measurement
+    is counted, so they should be quick. An exception in a hook is printed
+    and does not affect the scan.
+
+    Attributes:
+        hooks (list): Callables invoked as hook(name, ns) after each stage.
+    """
+
+    def __init__(self, hooks: Optional[List[StageHook]] = None) -> None:
+        """
+        Initialize empty counters.
+
+        Args:
+            hooks (list, optional): Initial on_stage_end(name, ns) callables.
+        """
+        self.hooks: List[StageHook] = list(hooks or [])
+        self._stages: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, ns: int, nbytes: int = 0) -> None:
+        """
+        Count one stage duration and pass it to the hooks.
+
+        Args:
+            name (str): The stage, e.g. "detect.capture".
+            ns (int): Its duration in nanoseconds.
+            nbytes (int): Bytes the stage copied.
+        """
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                stage = self._stages[name] = StageStats()
+            stage.add(ns, nbytes)
+        for hook in self.hooks:
+            try:
+                hook(name, ns)
+            except Exception as err:
+                print("Error in stage hook:", err)
+
+    def lap(self, name: str, start: int, nbytes: int = 0) -> int:
+        """
+        Record the time since start as one stage.
+
+        Args:
+            name (str): The stage.
+            start (int): time.perf_counter_ns() at the start of the stage.
+            nbytes (int): Bytes the stage copied.
+
+        Returns:
+            int: The current time.perf_counter_ns(), the start of the next stage.
+        """
+        now = time.perf_counter_ns()
+        self.record(name, now - start, nbytes)
+        return now
+
+    def add_hook(self, hook: StageHook) -> None:
+        """
+        Call hook(name, ns) after every measured stage.
+
+        Args:
+            hook (callable): The function to add.
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: StageHook) -> None:
+        """
+        Stop calling a hook added earlier.
+
+        Args:
+            hook (callable): The function to remove.
+
+        Raises:
+            ValueError: If hook was not added.
+        """
+        self.hooks.remove(hook)
+
+    def reset(self) -> None:
+        """Forget every measurement. Hooks are kept."""
+        with self._lock:
+            self._stages.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the counters of every stage measured so far.
+
+        Returns:
+            dict: Stage name to StageStats.snapshot().
+        """
+        with self._lock:
+            return {name: stage.snapshot() for name, stage in sorted(self._stages.items())}
@@ -0,0 +1,214 @@
+"""
+Process-pool batch engine.
+
+ParallelScanner runs detection (and optionally normalization) in worker
+processes, side-stepping the GIL held by parts of the SDK's capture(). Each
+worker initializes the license and builds its capture router once, at
+process start, and then serves many tasks.
+
+Images travel to the workers as file paths or through shared-memory blocks,
+and normalized images travel back the same way, so only small descriptors
+and quad coordinates are pickled.
+
+Example:
+    from docscanner.parallel import ParallelScanner
+
+    with ParallelScanner(license_key, workers=8) as engine:
+        for index, results in engine.detect_batch(paths, EnumImageColourMode.ICM_COLOUR):
+            if isinstance(results, Exception):
+                continue
+            for result in results:
+                cv2.imwrite(f"{index}.png", result.normalized_image)
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from . import (
+    DocumentResult,
+    DocumentScanner,
+    EnumImageColourMode,
+    _iter_windowed,
+    default_pool_size,
+    initLicense,
+)
+
+# (shared-memory name, shape, dtype string) describing an array in shared memory.
+ArrayHandle = Tuple[str, Tuple[int, ...], str]
+
+_worker_scanner: Optional[DocumentScanner] = None
+
+
+def _share_array(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, ArrayHandle]:
+    """Copy an array into a new shared-memory block and return the block and its handle."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    view[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _take_array(handle: ArrayHandle) -> np.ndarray:
+    """Copy an array out of a shared-memory block created by a worker and free the block."""
+    name, shape, dtype = handle
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=dtype, buffer=block.buf).copy()
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _init_worker(license_key: str) -> None:
+    """Process initializer: set the license and warm up the worker's router."""
+    global _worker_scanner
+    initLicense(license_key)
+    _worker_scanner = DocumentScanner(pool_size=1)
+    _worker_scanner.pool.checkin(_worker_scanner.pool.checkout())
+
+
+def _process(image: Union[str, np.ndarray], colour_mode: Optional[EnumImageColourMode]) -> List[Tuple[np.ndarray, Optional[ArrayHandle]]]:
+    """Detect and optionally normalize one image with the worker's scanner."""
+    # Decode once: detection and every normalize() then share the ImageData.
+    source = _worker_scanner._decode_source(image)
+    if source is None:
+        raise IOError(f"Cannot read image: {image}")
+    output = []
+    for document in _worker_scanner._detect(source, source):
+        handle = None
+        if colour_mode is not None:
+            mat = _worker_scanner.normalize(document, colour_mode)
+            if mat is not None:
+                block, handle = _share_array(mat)
+                block.close()
+        output.append((document.quad, handle))
+    return output
+
+
+def _run_task(input: Union[str, ArrayHandle], colour_mode: Optional[EnumImageColourMode]) -> Any:
+    """
+    Worker entry point for one batch input.
+
+    Returns:
+        A list of (quad, normalized image handle or None) pairs, where quad is
+        the (4, 2) corner array, or the exception raised for this input.
+    """
+    try:
+        if isinstance(input, str):
+            return _process(input, colour_mode)
+
+        name, shape, dtype = input
+        block = shared_memory.SharedMemory(name=name)
+        try:
+            return _process(np.ndarray(shape, dtype=dtype, buffer=block.buf), colour_mode)
+        finally:
+            block.close()
+    except Exception as err:
+        return err
+
+
+class ParallelScanner:
+    """
+    Batch document scanner backed by a pool of worker processes.
+
+    Each worker calls initLicense() and creates its CaptureVisionRouter once
+    when the process starts. Use it as a context manager, or call close() when
+    done, to shut the workers down.
+    """
+
+    def __init__(self, license_key: str, workers: Optional[int] = None,
+                 mp_context: Optional[Any] = None) -> None:
+        """
+        Start the worker processes.
+
+        Args:
+            license_key (str): License key passed to initLicense() in each worker.
+            workers (int, optional): Number of worker processes. Defaults to the
+                                     number of CPU cores.
+            mp_context (optional): A multiprocessing context, for example
+                                   multiprocessing.get_context("spawn").
+        """
+        if workers is None:
+            workers = default_pool_size()
+        self.workers: int = workers
+        if os.name == "posix":
+            # Start the tracker before any worker exists so that parent and
+            # workers share it and blocks are registered exactly once.
+            resource_tracker.ensure_running()
+        self._executor = ProcessPoolExecutor(max_workers=workers,
+                                             mp_context=mp_context or multiprocessing.get_context(),
+                                             initializer=_init_worker,
+                                             initargs=(license_key,))
+
+    def __enter__(self) -> "ParallelScanner":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        self._executor.shutdown(wait=True)
+
+    def detect_batch(self, inputs: Iterable[Union[str, np.ndarray]],
+                     colour_mode: Optional[EnumImageColourMode] = None,
+                     ordered: bool = False) -> Iterator[Tuple[int, Union[List[DocumentResult], Exception]]]:
+        """
+        Detect documents in many images across the worker processes.
+
+        File paths are sent as strings and decoded by the worker. Arrays are
+        copied once into shared memory rather than pickled.
+
+        Args:
+            inputs (Iterable[Union[str, np.ndarray]]): File paths or OpenCV matrices.
+            colour_mode (EnumImageColourMode, optional): If set, each detected
+                document is also normalized in the worker and returned in
+                DocumentResult.normalized_image.
+            ordered (bool): If True, yield results in input order.
+
+        Yields:
+            Tuple[int, Union[List[DocumentResult], Exception]]: The input index and
+            either the detected documents or the exception raised for that input.
+            DocumentResult.source is set to the original input.
+        """
+        in_flight = {}
+
+        def submit(input: Union[str, np.ndarray]) -> Any:
+            if isinstance(input, str):
+                block, task = None, input
+            else:
+                block, task = _share_array(np.asarray(input))
+            future = self._executor.submit(_run_task, task, colour_mode)
+            in_flight[id(future)] = (block, input)
+            return future
+
+        try:
+            for index, future in _iter_windowed(submit, inputs, self.workers * 2, ordered):
+                block, source = in_flight.pop(id(future))
+                if block is not None:
+                    block.close()
+                    block.unlink()
+
+                output = future.result()
+                if isinstance(output, Exception):
+                    yield index, output
+                    continue
+
+                documents: List[DocumentResult] = []
+                for quad, handle in output:
+                    document = DocumentResult(quad=quad)
+                    document.source = source
+                    if handle is not None:
+                        document.normalized_image = _take_array(handle)
+                    documents.append(document)
+                yield index, documents
+        finally:
+            # The caller stopped early: release input blocks still in flight.
+            for block, _ in in_flight.values():
+                if block is not None:
+                    block.close()
+                    block.unlink()
@@ -0,0 +1,120 @@
+"""
+Router pool for thread-safe synchronous capture.
+
+A CaptureVisionRouter carries mutable template settings (for example the ROI
+that normalize() writes into PT_NORMALIZE_DOCUMENT), so a single router cannot
+be shared by concurrent callers. RouterPool hands out one router per caller
+and takes it back when the caller is done, letting one DocumentScanner serve
+a whole thread pool.
+"""
+
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+from dynamsoft_capture_vision_bundle import CaptureVisionRouter
+
+
+def default_pool_size() -> int:
+    """
+    Return the default number of routers in a pool.
+
+    Returns:
+        int: The number of logical CPU cores, or 1 if it cannot be determined.
+    """
+    return os.cpu_count() or 1
+
+
+class RouterPool:
+    """
+    A bounded pool of CaptureVisionRouter instances.
+
+    Routers are created lazily, up to ``size``, the first time they are needed.
+    When all routers are checked out, checkout() blocks until one is returned.
+
+    Example:
+        pool = RouterPool(4)
+        with pool.router() as cvr:
+            result = cvr.capture("document.jpg", EnumPresetTemplate.PT_DETECT_DOCUMENT_BOUNDARIES)
+    """
+
+    def __init__(self, size: Optional[int] = None,
+                 factory: Callable[[], CaptureVisionRouter] = CaptureVisionRouter) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            size (int, optional): Maximum number of routers. Defaults to the
+                                  number of CPU cores.
+            factory (callable, optional): Function used to build a new router.
+        """
+        if size is None:
+            size = default_pool_size()
+        if size < 1:
+            raise ValueError("Router pool size must be at least 1")
+        self.size: int = size
+        self._factory = factory
+        self._idle: "queue.LifoQueue[CaptureVisionRouter]" = queue.LifoQueue()
+        self._routers: List[CaptureVisionRouter] = []
+        self._lock = threading.Lock()
+
+    def checkout(self, timeout: Optional[float] = None) -> CaptureVisionRouter:
+        """
+        Take a router out of the pool.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a free router.
+                                       None waits forever.
+
+        Returns:
+            CaptureVisionRouter: A router reserved for the caller until it is
+                                 passed back to checkin().
+
+        Raises:
+            queue.Empty: If no router became free within ``timeout``.
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._routers) < self.size:
+                cvr = self._factory()
+                self._routers.append(cvr)
+                return cvr
+
+        return self._idle.get(timeout=timeout)
+
+    def checkin(self, cvr: CaptureVisionRouter) -> None:
+        """
+        Return a router obtained from checkout() to the pool.
+
+        Args:
+            cvr (CaptureVisionRouter): The router to return.
+        """
+        self._idle.put(cvr)
+
+    @contextmanager
+    def router(self, timeout: Optional[float] = None) -> Iterator[CaptureVisionRouter]:
+        """
+        Context manager that checks a router out and always returns it.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a free router.
+
+        Yields:
+            CaptureVisionRouter: A router reserved for the body of the with-block.
+        """
+        cvr = self.checkout(timeout)
+        try:
+            yield cvr
+        finally:
+            self.checkin(cvr)
+
+    @property
+    def created(self) -> int:
+        """Number of routers created so far."""
+        return len(self._routers)
@@ -0,0 +1,157 @@
+"""
+Region-of-interest search for consecutive frames.
+
+In a camera stream a document moves little from one frame to the next, so
+once it has been found the next detection only needs to look at the area
+around it. RoiSearch remembers the bounding box of the last documents
+found, grows it by a margin, and hands out that region for the next
+search. The crop is a numpy view, so only the region's pixels are copied
+when the frame is handed to the SDK. After max_misses searches in the
+region find nothing, the whole frame is searched again.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# (x0, y0, x1, y1) pixel bounds of a search region, end exclusive.
+Region = Tuple[int, int, int, int]
+
+
+class RoiSearch:
+    """
+    Restrict detection to an expanded box around the last detected quads.
+
+    Attributes:
+        margin (float): Fraction of the box width and height added on each side.
+        max_misses (int): Region searches without a result before the whole
+                          frame is searched again.
+        region_searches (int): Searches restricted to a region.
+        full_searches (int): Searches of the whole frame.
+        fallbacks (int): Times max_misses was reached.
+        searched_pixels (int): Pixels handed to detection.
+        frame_pixels (int): Pixels of the frames searched, for comparison.
+    """
+
+    def __init__(self, margin: float = 0.15, max_misses: int = 3) -> None:
+        """
+        Initialize a search with no previous documents.
+
+        Args:
+            margin (float): Fraction of the quads' bounding box width and height
+                            added on each side of it.
+            max_misses (int): Number of consecutive empty region searches before
+                              falling back to the whole frame.
+
+        Raises:
+            ValueError: If margin is negative or max_misses is less than 1.
+        """
+        if margin < 0:
+            raise ValueError("margin must not be negative")
+        if max_misses < 1:
+            raise ValueError("max_misses must be at least 1")
+        self.margin: float = margin
+        self.max_misses: int = max_misses
+        self.region_searches: int = 0
+        self.full_searches: int = 0
+        self.fallbacks: int = 0
+        self.searched_pixels: int = 0
+        self.frame_pixels: int = 0
+        self._box: Optional[np.ndarray] = None
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def crop(self, mat: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Cut the search region out of a frame.
+
+        Args:
+            mat (numpy.ndarray): The full frame.
+
+        Returns:
+            tuple: The view to detect in, and the (x, y) offset to add to its
+                   coordinates, or the frame itself and None for a full search.
+        """
+        height, width = mat.shape[:2]
+        region = self.region(width, height)
+        with self._lock:
+            self.frame_pixels += width * height
+            if region is None:
+                self.full_searches += 1
+                self.searched_pixels += width * height
+                return mat, None
+            x0, y0, x1, y1 = region
+            self.region_searches += 1
+            self.searched_pixels += (x1 - x0) * (y1 - y0)
+        return mat[y0:y1, x0:x1], np.array([x0, y0], dtype=np.float32)
+
+    def region(self, width: int, height: int) -> Optional[Region]:
+        """
+        Return the region to search in a frame of the given size.
+
+        Args:
+            width (int): Frame width.
+            height (int): Frame height.
+
+        Returns:
+            tuple or None: (x0, y0, x1, y1) bounds, or None to search the whole frame.
+        """
+        with self._lock:
+            box = self._box
+        if box is None:
+            return None
+        (left, top), (right, bottom) = box
+        pad_x = (right - left) * self.margin
+        pad_y = (bottom - top) * self.margin
+        x0 = max(0, int(left - pad_x))
+        y0 = max(0, int(top - pad_y))
+        x1 = min(width, int(np.ceil(right + pad_x)) + 1)
+        y1 = min(height, int(np.ceil(bottom + pad_y)) + 1)
+        if x1 - x0 < 2 or y1 - y0 < 2 or (x0, y0, x1, y1) == (0, 0, width, height):
+            return None
+        return x0, y0, x1, y1
+
+    def update(self, quads: np.ndarray, in_region: bool) -> None:
+        """
+        Record the outcome of a search.
+
+        Args:
+            quads (numpy.ndarray): (N, 4, 2) quads found, in full-frame coordinates.
+            in_region (bool): True if the search was restricted to a region.
+        """
+        with self._lock:
+            if len(quads):
+                points = np.asarray(quads, dtype=np.float32).reshape(-1, 2)
+                self._box = np.array([points.min(axis=0), points.max(axis=0)])
+                self._misses = 0
+            elif not in_region:
+                self._box = None
+            else:
+                self._misses += 1
+                if self._misses >= self.max_misses:
+                    self._box = None
+                    self._misses = 0
+                    self.fallbacks += 1
+
+    def reset(self) -> None:
+        """Forget the last documents, so that the next search covers the whole frame."""
+        with self._lock:
+            self._box = None
+            self._misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return the search counters.
+
+        Returns:
+            dict: region_searches, full_searches, fallbacks, and pixel_ratio,
+                  the fraction of frame pixels that were searched.
+        """
+        with self._lock:
+            return {
+                "region_searches": self.region_searches,
+                "full_searches": self.full_searches,
+                "fallbacks": self.fallbacks,
+                "pixel_ratio": self.searched_pixels / self.frame_pixels if self.frame_pixels else 1.0,
+            }
@@ -1,11 +1,22 @@
 import argparse
 import docscanner
 from docscanner import *
+from docscanner import _iter_windowed
+from concurrent.futures import ThreadPoolExecutor
+import glob
+import json
+import os
 import sys
 import numpy as np
 import cv2
 import time
 
+COLOUR_MODES = {
+    'colour': EnumImageColourMode.ICM_COLOUR,
+    'gray': EnumImageColourMode.ICM_GRAYSCALE,
+    'binary': EnumImageColourMode.ICM_BINARY,
+}
+
 g_results = None
 g_normalized_images = []
 index = 0
@@ -20,7 +31,7 @@ def showNormalizedImage(name, normalized_image):
     cv2.imshow(name, normalized_image)
 
 
-def process_file(filename, scanner):
+def process_file(filename, scanner, gui=True):
     image = cv2.imread(filename)
     results = scanner.detect(image)
     normalized_image = None
@@ -39,10 +50,11 @@ def process_file(filename, scanner):
         cv2.drawContours(
             image, [np.array([(x1, y1), (x2, y2), (x3, y3), (x4, y4)], dtype=np.int32)], 0, (0, 255, 0), 2)
 
-    cv2.putText(image, 'Press "ESC" to exit', (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
-    cv2.imshow('Document Image', image)
-    cv2.waitKey(0)
+    if gui:
+        cv2.putText(image, 'Press "ESC" to exit', (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+        cv2.imshow('Document Image', image)
+        cv2.waitKey(0)
 
     if normalized_image is not None:
         cv2.imwrite(str(time.time()) + '.png', normalized_image)
@@ -51,9 +63,135 @@ def process_file(filename, scanner):
         print('No document found')
 
 
+def find_inputs(input_dir, pattern):
+    """List the readable image files matching pattern, below input_dir if given."""
+    if input_dir is not None:
+        pattern = os.path.join(input_dir, pattern)
+    paths = glob.glob(pattern, recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path) and cv2.haveImageReader(path))
+
+
+def read_manifest(path):
+    """Return the inputs recorded without error in a JSONL manifest."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path) as manifest:
+        for line in manifest:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by an interrupted run
+            if 'error' not in record:
+                done.add(record['input'])
+    return done
+
+
+def scan_file(scanner, path, output_path, extension, colour_mode):
+    """Detect and normalize the documents of one file and write them out. Returns a manifest record."""
+    record = {'input': path}
+    start = time.perf_counter()
+    try:
+        image = cv2.imread(path)
+        if image is None:
+            raise IOError('Cannot read image: {}'.format(path))
+        decoded = time.perf_counter()
+        record['width'], record['height'] = image.shape[1], image.shape[0]
+
+        # One ImageData is the detection input and the source of every
+        # normalization. _detect() raises on SDK errors, which detect() would
+        # only print, so they are recorded and the input is retried on --resume.
+        image_data = convertMat2ImageData(image)
+        results = scanner._detect(image_data, image_data)
+        detected = time.perf_counter()
+
+        outputs = []
+        normalized_images = scanner.normalize_many(results, colour_mode)
+        for number, normalized_image in enumerate(normalized_images, 1):
+            if normalized_image is None:
+                raise RuntimeError('Cannot normalize document {} of {}'.format(number, path))
+            output = '{}_{}.{}'.format(output_path, number, extension)
+            if not cv2.imwrite(output, normalized_image):
+                raise IOError('Cannot write image: {}'.format(output))
+            outputs.append(output)
+        normalized = time.perf_counter()
+
+        record['quads'] = [result.quad.tolist() for result in results]
+        record['outputs'] = outputs
+        record['decode_ms'] = round((decoded - start) * 1000, 2)
+        record['detect_ms'] = round((detected - decoded) * 1000, 2)
+        record['normalize_ms'] = round((normalized - detected) * 1000, 2)
+    except Exception as err:
+        record['error'] = str(err)
+    record['total_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return record
+
+
+def process_batch(paths, scanner, args):
+    colour_mode = COLOUR_MODES[args.colour]
+    extension = args.format
+    os.makedirs(args.output_dir, exist_ok=True)
+    manifest_path = args.manifest or os.path.join(args.output_dir, 'manifest.jsonl')
+
+    skipped = 0
+    if args.resume:
+        done = read_manifest(manifest_path)
+        skipped = sum(path in done for path in paths)
+        paths = [path for path in paths if path not in done]
+
+    root = args.input_dir or os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths] or ['.'])
+
+    def output_path(path):
+        relative = os.path.relpath(os.path.abspath(path), os.path.abspath(root))
+        if relative.startswith('..'):
+            relative = os.path.basename(path)
+        # The source extension stays in the stem, so a.png and a.jpg do not
+        # write over each other's outputs.
+        stem = os.path.join(args.output_dir, relative)
+        os.makedirs(os.path.dirname(stem), exist_ok=True)
+        return stem
+
+    images = documents = failed = pixels = 0
+    start = time.perf_counter()
+    with open(manifest_path, 'a' if args.resume else 'w') as manifest, \
+            ThreadPoolExecutor(max_workers=args.workers) as executor:
+        submit = lambda path: executor.submit(scan_file, scanner, path, output_path(path), extension, colour_mode)
+        for _, future in _iter_windowed(submit, paths, args.workers * 2, False):
+            record = future.result()
+            manifest.write(json.dumps(record) + '\n')
+            manifest.flush()
+            images += 1
+            if 'error' in record:
+                failed += 1
+                print('Failed {}: {}'.format(record['input'], record['error']))
+                continue
+            documents += len(record['outputs'])
+            pixels += record['width'] * record['height']
+    elapsed = time.perf_counter() - start
+
+    print('Processed {} images ({} failed, {} skipped), {} documents in {:.1f}s'.format(
+        images, failed, skipped, documents, elapsed))
+    if elapsed > 0:
+        print('Throughput: {:.2f} images/s, {:.2f} MPix/s'.format(images / elapsed, pixels / elapsed / 1e6))
+    print('Manifest: {}'.format(manifest_path))
+    return failed
+
+
+def process_video_file(filename, scanner, sample_fps):
+    pages = scanner.scan_video(filename, sample_fps=sample_fps)
+    name = os.path.splitext(os.path.basename(filename))[0]
+    for number, page in enumerate(pages, 1):
+        output = '{}-page{}.png'.format(name, number)
+        cv2.imwrite(output, page.result.normalized_image)
+        print('Page {} at {:.1f}s saved to {}'.format(number, page.timestamp, output))
+    if not pages:
+        print('No document found')
+
+
 def process_video(scanner):
     global g_normalized_images, index
-    scanner.addAsyncListener(callback)
+    # Detect only; frames are warped on demand from the scanner's frame history.
+    scanner.addAsyncListener(callback, normalize=False)
 
     cap = cv2.VideoCapture(0)
     while True:
@@ -76,10 +214,11 @@ def process_video(scanner):
                         x4 = result.x4
                         y4 = result.y4
 
-                        if result.normalized_image is not None:
+                        normalized_image = scanner.normalize(result)
+                        if normalized_image is not None:
                             g_normalized_images.append(
-                                (str(index), result.normalized_image))
-                            showNormalizedImage(str(index), result.normalized_image)
+                                (str(index), normalized_image))
+                            showNormalizedImage(str(index), normalized_image)
                             index += 1
                 else:
                     print('No document found')
@@ -124,14 +263,38 @@ def process_video(scanner):
 def scandocument():
     """
     Command-line script for scanning documents from a given image or camera video stream.
+
+    ``scandocument bench ...`` runs the benchmark suite in docscanner.bench instead.
     """
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        from docscanner import bench
+        sys.exit(bench.main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
-        description='Scan documents from an image file or camera')
+        description='Scan documents from an image file, a video file or camera')
     parser.add_argument('-f', '--file', help='Path to the image file')
+    parser.add_argument('-v', '--video', help='Path to a video file of document pages')
+    parser.add_argument('--sample-fps', default=5.0, type=float,
+                        help='Video frames per second to scan')
     parser.add_argument('-c', '--camera', default=False,
                         type=bool, help='Whether to show the image')
     parser.add_argument('-l', '--license', default='',
                         type=str, help='Set a valid license key')
+    batch = parser.add_argument_group('batch mode')
+    batch.add_argument('--input-dir', help='Scan every image in this directory')
+    batch.add_argument('--glob', help='Input file pattern, relative to --input-dir if given; ** recurses')
+    batch.add_argument('--output-dir', help='Where normalized images and the manifest are written')
+    batch.add_argument('--workers', default=os.cpu_count() or 1, type=int,
+                       help='Number of images processed in parallel')
+    batch.add_argument('--format', default='png', choices=['jpg', 'png', 'tiff'],
+                       help='Output image format')
+    batch.add_argument('--colour', default='colour', choices=sorted(COLOUR_MODES),
+                       help='Colour mode of the normalized images')
+    batch.add_argument('--manifest', help='JSONL manifest path (default: OUTPUT_DIR/manifest.jsonl)')
+    batch.add_argument('--resume', action='store_true',
+                       help='Skip inputs already recorded in the manifest and append to it')
+    parser.add_argument('--no-gui', action='store_true',
+                        help='Do not open any window; with --file, only save the result')
     args = parser.parse_args()
     # print(args)
     try:
@@ -139,9 +302,12 @@ def scandocument():
         license = args.license
         camera = args.camera
 
-        if filename is None and camera is False:
+        batch_mode = args.input_dir is not None or args.glob is not None
+        if filename is None and args.video is None and camera is False and not batch_mode:
             parser.print_help()
             return
+        if batch_mode and args.output_dir is None:
+            parser.error('--output-dir is required with --input-dir or --glob')
 
         # set license
         if license == '':
@@ -150,11 +316,22 @@ def scandocument():
         else:
             docscanner.initLicense(license)
 
+        if batch_mode:
+            paths = find_inputs(args.input_dir, args.glob or '*')
+            scanner = docscanner.createInstance(pool_size=args.workers)
+            if process_batch(paths, scanner, args):
+                sys.exit(1)
+            return
+
         # initialize mrz scanner
-        scanner = docscanner.createInstance()
+        # A short frame buffer keeps each result within a few frames of the
+        # newest, so its frame is still in the history when 'n' normalizes it.
+        scanner = docscanner.createInstance(frame_buffer_size=2, frame_history=8)
 
         if filename is not None:
-            process_file(filename, scanner)
+            process_file(filename, scanner, not args.no_gui)
+        elif args.video is not None:
+            process_video_file(args.video, scanner, args.sample_fps)
         elif camera is True:
             process_video(scanner)
 
@@ -0,0 +1,240 @@
+"""
+Optical-flow tracking of document quads between detections.
+
+Full boundary detection on every camera frame is the main CPU cost of the
+async path. QuadTracker follows the corners of the last detected documents
+with pyramidal Lucas-Kanade flow on a small grayscale copy of each frame,
+and asks for a full detection only every redetect_interval frames, or as
+soon as tracking becomes unreliable.
+
+Corners are tracked from the last detected frame rather than from the
+previous frame, so small flow errors do not add up between detections.
+Each corner is tracked forward and then back again. A corner whose round
+trip misses its start by more than max_error pixels is lost. A quad that
+loses a corner moves it by the mean motion of its other corners. Once a
+quad keeps fewer than min_confidence of its corners, the tracker gives up
+and the next frame is detected.
+
+Example:
+    tracker = QuadTracker(redetect_interval=10)
+    for mat in frames:
+        frame = tracker.prepare(mat)
+        quads = tracker.track(frame)
+        if quads is None:
+            quads = stack_quads(scanner.detect(mat))
+            tracker.anchor(frame, quads)
+"""
+
+import threading
+from typing import Dict, NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+
+class TrackFrame(NamedTuple):
+    """A frame prepared for tracking: its sequence number, small grayscale copy and scale."""
+    number: int
+    gray: np.ndarray
+    scale: float
+
+
+class QuadTracker:
+    """
+    Follow detected quads from frame to frame with sparse optical flow.
+
+    prepare() and track() are called by the frame producer, anchor() by
+    whoever delivers detection results, possibly on another thread.
+
+    Attributes:
+        redetect_interval (int): Frames tracked between two detection requests.
+        min_confidence (float): Fraction of a quad's corners that must track
+                                reliably, between 0 and 1.
+        smoothing (float): Weight of the previous position in the reported
+                           corners, between 0 (raw flow) and 1 (frozen).
+        max_error (float): Largest forward-backward error, in pixels of the
+                           full frame, of a reliable corner.
+        max_side (int or None): Longest side of the grayscale copy tracked on.
+        tracked (int): Frames answered by tracking.
+        requested (int): Frames for which a detection was requested.
+        lost (int): Times tracking was abandoned for low confidence.
+    """
+
+    def __init__(self, redetect_interval: int = 10, min_confidence: float = 0.75,
+                 smoothing: float = 0.3, max_error: float = 2.0, max_side: Optional[int] = 640,
+                 window: int = 21, levels: int = 3) -> None:
+        """
+        Initialize a tracker with no documents.
+
+        Args:
+            redetect_interval (int): Request a detection after this many tracked frames.
+            min_confidence (float): Minimum fraction of reliable corners per quad.
+            smoothing (float): Exponential smoothing of the reported corners.
+            max_error (float): Forward-backward error threshold in full-frame pixels.
+            max_side (int, optional): Track on a copy whose longer side is at most
+                                      this many pixels. None tracks at full size.
+            window (int): Side of the Lucas-Kanade search window, in pixels.
+            levels (int): Number of pyramid levels above the base image.
+
+        Raises:
+            ValueError: If redetect_interval is less than 1.
+        """
+        if redetect_interval < 1:
+            raise ValueError("redetect_interval must be at least 1")
+        self.redetect_interval: int = redetect_interval
+        self.min_confidence: float = min_confidence
+        self.smoothing: float = smoothing
+        self.max_error: float = max_error
+        self.max_side: Optional[int] = max_side
+        self.tracked: int = 0
+        self.requested: int = 0
+        self.lost: int = 0
+        self._lk_params = dict(winSize=(window, window), maxLevel=levels,
+                               criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+        self._lock = threading.Lock()
+        self._number = 0
+        # Corners are always tracked from the anchor frame, the last detected
+        # one, so flow errors do not accumulate from frame to frame. Kept are
+        # the anchor's gray image and corners, the last raw corners, both in
+        # gray coordinates, and the smoothed corners in full-frame coordinates.
+        # _gray is None while nothing is being tracked.
+        self._gray: Optional[np.ndarray] = None
+        self._anchor_points: Optional[np.ndarray] = None
+        self._points: Optional[np.ndarray] = None
+        self._smoothed: Optional[np.ndarray] = None
+        self._anchor_number = -1
+        self._since_request = 0
+
+    def prepare(self, mat: np.ndarray) -> TrackFrame:
+        """
+        Build the small grayscale copy of a frame that tracking works on.
+
+        Args:
+            mat (numpy.ndarray): The full-resolution frame, BGR or grayscale.
+
+        Returns:
+            TrackFrame: Pass it to track() and, if the frame is detected, to anchor().
+        """
+        # Converting first makes the resize work on one channel instead of three.
+        gray = cv2.cvtColor(mat, cv2.COLOR_BGR2GRAY) if mat.ndim == 3 else mat
+        height, width = gray.shape
+        scale = 1.0
+        if self.max_side is not None and max(height, width) > self.max_side:
+            scale = self.max_side / max(height, width)
+            gray = cv2.resize(gray, (max(1, round(width * scale)), max(1, round(height * scale))),
+                              interpolation=cv2.INTER_AREA)
+        with self._lock:
+            self._number += 1
+            return TrackFrame(self._number, gray, scale)
+
+    def track(self, frame: TrackFrame) -> Optional[np.ndarray]:
+        """
+        Move the tracked quads onto a new frame.
+
+        Args:
+            frame (TrackFrame): The frame returned by prepare().
+
+        Returns:
+            numpy.ndarray or None: (N, 4, 2) float32 smoothed corners in
+            full-frame coordinates, or None if the frame should be detected
+            instead: nothing is tracked, tracking was lost, or a periodic
+            detection is due.
+        """
+        with self._lock:
+            if self._gray is None:
+                self.requested += 1
+                return None
+            if self._since_request >= self.redetect_interval:
+                # Keep tracking until the detection arrives, but ask only once
+                # per interval, which also covers a detection frame that was dropped.
+                self._since_request = 0
+                self.requested += 1
+                return None
+
+            points = self._flow(frame.gray, frame.scale)
+            if points is None:
+                self._reset()
+                self.lost += 1
+                self.requested += 1
+                return None
+            self._smoothed += (1.0 - self.smoothing) * (points / frame.scale - self._smoothed)
+            self._points = points
+            self._since_request += 1
+            self.tracked += 1
+            return self._smoothed.copy()
+
+    def anchor(self, frame: TrackFrame, quads: np.ndarray) -> None:
+        """
+        Restart tracking from a detection result.
+
+        Results for frames older than the last anchor are ignored. An empty
+        result stops tracking, so following frames are detected.
+
+        Args:
+            frame (TrackFrame): The frame the detection ran on.
+            quads (numpy.ndarray): (N, 4, 2) detected corners in full-frame coordinates.
+        """
+        with self._lock:
+            if frame.number < self._anchor_number:
+                return
+            self._anchor_number = frame.number
+            self._since_request = 0
+            if len(quads) == 0:
+                self._reset()
+                return
+            self._gray = frame.gray
+            self._smoothed = np.array(quads, dtype=np.float32).reshape(-1, 4, 2)
+            self._anchor_points = self._smoothed * frame.scale
+            self._points = self._anchor_points
+
+    def reset(self) -> None:
+        """Forget the tracked quads, so that the next frame is detected."""
+        with self._lock:
+            self._reset()
+            self._anchor_number = -1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the tracker counters.
+
+        Returns:
+            dict: tracked, requested and lost.
+        """
+        with self._lock:
+            return {"tracked": self.tracked, "requested": self.requested, "lost": self.lost}
+
+    def _reset(self) -> None:
+        self._gray = None
+        self._anchor_points = None
+        self._points = None
+        self._smoothed = None
+        self._since_request = 0
+
+    def _flow(self, current: np.ndarray, scale: float) -> Optional[np.ndarray]:
+        """
+        Track the anchor corners onto current, starting from their last position.
+
+        Returns:
+            numpy.ndarray or None: (N, 4, 2) moved corners, with unreliable ones
+            moved like the rest of their quad, or None if some quad kept too
+            few reliable corners.
+        """
+        start = self._anchor_points.reshape(-1, 1, 2)
+        points = self._points
+        forward, status, _ = cv2.calcOpticalFlowPyrLK(self._gray, current, start, points.reshape(-1, 1, 2).copy(),
+                                                      flags=cv2.OPTFLOW_USE_INITIAL_FLOW, **self._lk_params)
+        backward, back_status, _ = cv2.calcOpticalFlowPyrLK(current, self._gray, forward, start.copy(),
+                                                            flags=cv2.OPTFLOW_USE_INITIAL_FLOW, **self._lk_params)
+        error = np.linalg.norm((backward - start).reshape(-1, 2), axis=1)
+        good = ((status.ravel() == 1) & (back_status.ravel() == 1) &
+                (error <= self.max_error * scale)).reshape(-1, 4)
+        if (good.mean(axis=1) < self.min_confidence).any() or not good.any(axis=1).all():
+            return None
+
+        moved = forward.reshape(-1, 4, 2)
+        if not good.all():
+            motion = moved - points
+            weights = good[..., None].astype(np.float32)
+            mean_motion = (motion * weights).sum(axis=1, keepdims=True) / weights.sum(axis=1, keepdims=True)
+            moved = np.where(good[..., None], moved, points + mean_motion)
+        return moved.astype(np.float32)
@@ -0,0 +1,189 @@
+"""
+Video file ingestion for DocumentScanner.scan_video().
+
+A phone video of a multi-page document shows each page for a while, then
+a page turn. scan_video() samples the video at a fixed rate, detects the
+page in each sampled frame, groups consecutive frames showing the same
+page into segments, and normalizes only the sharpest frame of each
+segment.
+
+Decoding runs on a read-ahead thread. Frames that sampling skips are only
+grabbed: the decoder still decodes them, since later frames depend on
+them, but they are never converted to BGR and copied into an array.
+"""
+
+import queue
+import threading
+from typing import Any, Iterator, List, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from . import DocumentResult, DocumentScanner, EnumImageColourMode
+from .geometry import quad_areas
+
+# Size of the small grayscale warp of a page used for sharpness and, shrunk
+# further, for telling pages apart.
+_THUMB_WIDTH, _THUMB_HEIGHT = 192, 256
+_COMPARE_SIZE = (48, 64)
+
+_END = object()
+
+
+class VideoPage(NamedTuple):
+    """The best frame of one stable segment: its frame index, time in seconds and normalized document."""
+    frame_index: int
+    timestamp: float
+    result: DocumentResult
+
+
+def read_frames(path: str, sample_fps: Optional[float] = None, max_frames: Optional[int] = None,
+                read_ahead: int = 8) -> Iterator[Tuple[int, float, np.ndarray]]:
+    """
+    Decode sampled frames of a video file on a background thread.
+
+    Args:
+        path (str): The video file.
+        sample_fps (float, optional): Frames per second to keep. None keeps every frame.
+        max_frames (int, optional): Stop after this many sampled frames.
+        read_ahead (int): Number of decoded frames queued ahead of the consumer.
+
+    Yields:
+        Tuple[int, float, numpy.ndarray]: Frame index, time in seconds and frame.
+
+    Raises:
+        IOError: If the video cannot be opened.
+    """
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise IOError(f"Cannot open video: {path}")
+    fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+    step = 1 if sample_fps is None or sample_fps >= fps else fps / sample_fps
+
+    frames: "queue.Queue[Any]" = queue.Queue(maxsize=max(read_ahead, 1))
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def decode() -> None:
+        try:
+            index, sampled, next_sample = 0, 0, 0.0
+            while not stop.is_set() and (max_frames is None or sampled < max_frames):
+                if index < round(next_sample):
+                    # grab() still decodes the frame, but skips retrieve(),
+                    # its colour conversion and the copy into an array.
+                    if not capture.grab():
+                        break
+                    index += 1
+                    continue
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                if not put((index, index / fps, frame)):
+                    return
+                index += 1
+                sampled += 1
+                next_sample += step
+            put(_END)
+        except Exception as err:
+            put(err)
+        finally:
+            capture.release()
+
+    thread = threading.Thread(target=decode, name="docscanner-video", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = frames.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+class _Segment:
+    """The frames of one page seen so far and the sharpest of them."""
+
+    def __init__(self) -> None:
+        self.length = 0
+        self.signature: Optional[np.ndarray] = None
+        self.best: Optional[Tuple[float, int, float, DocumentResult]] = None
+
+    def add(self, sharpness: float, index: int, timestamp: float, document: DocumentResult,
+            signature: np.ndarray) -> None:
+        self.length += 1
+        self.signature = signature
+        if self.best is None or sharpness > self.best[0]:
+            self.best = (sharpness, index, timestamp, document)
+
+
+def _page_thumb(frame: np.ndarray, quad: np.ndarray) -> np.ndarray:
+    """Warp a document to a small upright grayscale image."""
+    target = np.array([[0, 0], [_THUMB_WIDTH, 0], [_THUMB_WIDTH, _THUMB_HEIGHT], [0, _THUMB_HEIGHT]],
+                      dtype=np.float32)
+    warped = cv2.warpPerspective(frame, cv2.getPerspectiveTransform(quad, target), (_THUMB_WIDTH, _THUMB_HEIGHT))
+    return cv2.cvtColor(warped, cv2.COLOR_BGR2GRAY) if warped.ndim == 3 else warped
+
+
+def scan_video(scanner: DocumentScanner, path: str, sample_fps: Optional[float] = 5.0,
+               max_frames: Optional[int] = None, workers: Optional[int] = None,
+               colour_mode: EnumImageColourMode = EnumImageColourMode.ICM_COLOUR,
+               min_segment_frames: int = 2, page_change: float = 20.0) -> List[VideoPage]:
+    """
+    Implementation of DocumentScanner.scan_video().
+
+    The largest document of each sampled frame is warped to a small
+    grayscale thumbnail. A new segment starts when no document is found or
+    when a shrunk copy of the thumbnail differs from the previous one by
+    more than page_change gray levels on average, which catches page turns
+    whether or not the page moved. The frame with the highest Laplacian
+    variance in its thumbnail is kept for each segment, and only that one is
+    normalized.
+    """
+    pages: List[VideoPage] = []
+    segment = _Segment()
+    frame_info: "queue.SimpleQueue[Tuple[int, float]]" = queue.SimpleQueue()
+
+    def close_segment() -> None:
+        nonlocal segment
+        if segment.best is not None and segment.length >= min_segment_frames:
+            _, index, timestamp, document = segment.best
+            if scanner.normalize(document, colour_mode) is not None:
+                pages.append(VideoPage(index, timestamp, document))
+        segment = _Segment()
+
+    workers = workers or scanner.pool.size
+
+    def frames() -> Iterator[np.ndarray]:
+        for index, timestamp, frame in read_frames(path, sample_fps, max_frames, read_ahead=workers * 2):
+            frame_info.put((index, timestamp))
+            yield frame
+
+    for _, results in scanner.scan_stream(frames(), workers=workers):
+        index, timestamp = frame_info.get()
+        if isinstance(results, Exception) or not results:
+            close_segment()
+            continue
+
+        areas = np.abs(quad_areas(np.stack([result.quad for result in results])))
+        document = results[int(np.argmax(areas))]
+        thumb = _page_thumb(document.source, document.quad)
+        signature = cv2.resize(thumb, _COMPARE_SIZE, interpolation=cv2.INTER_AREA)
+        if segment.signature is not None and np.mean(cv2.absdiff(signature, segment.signature)) > page_change:
+            close_segment()
+        sharpness = float(cv2.Laplacian(thumb, cv2.CV_64F).var())
+        segment.add(sharpness, index, timestamp, document, signature)
+
+    close_segment()
+    return pages
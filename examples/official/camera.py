@@ -19,7 +19,12 @@ class MyCapturedResultReceiver(CapturedResultReceiver):
         self.result_queue = result_queue
 
     def on_captured_result_received(self, result):
-        self.result_queue.put(result)
+        # Keep only the latest result so a slow display loop never falls behind.
+        try:
+            self.result_queue.get_nowait()
+        except queue.Empty:
+            pass
+        self.result_queue.put_nowait(result)
 
 
 if __name__ == '__main__':
@@ -38,8 +43,8 @@ if __name__ == '__main__':
         fetcher = FrameFetcher()
         cvr.set_input(fetcher)
 
-        # Create a thread-safe queue to store captured items
-        result_queue = queue.Queue()
+        # Create a thread-safe single-slot queue holding the latest captured result
+        result_queue = queue.Queue(maxsize=1)
 
         receiver = MyCapturedResultReceiver(result_queue)
         cvr.add_result_receiver(receiver)
@@ -18,6 +18,7 @@ from dynamsoft_capture_vision_bundle import (
     Quadrilateral,
     Point,
 )
+from docscanner.convert import convertMat2ImageData, convertNormalizedImage2Mat
 
 
 DEFAULT_LICENSE_KEY = (
@@ -45,70 +46,22 @@ class Page:
 
 
 def np_to_image_data(image: np.ndarray) -> ImageData:
-    """Convert RGB or grayscale numpy array to DCV ImageData."""
-    if image.ndim == 2:
-        h, w = image.shape
-        stride = image.strides[0]
-        return ImageData(image.tobytes(), w, h, stride, EnumImagePixelFormat.IPF_GRAYSCALED)
-    if image.shape[2] == 3:
-        h, w = image.shape[:2]
-        stride = image.strides[0]
-        return ImageData(image.tobytes(), w, h, stride, EnumImagePixelFormat.IPF_RGB_888)
-    if image.shape[2] == 4:
-        h, w = image.shape[:2]
-        stride = image.strides[0]
-        return ImageData(image.tobytes(), w, h, stride, EnumImagePixelFormat.IPF_ARGB_8888)
-    # Fallback: assume BGR and convert
-    rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    h, w = rgb.shape[:2]
-    stride = rgb.strides[0]
-    return ImageData(rgb.tobytes(), w, h, stride, EnumImagePixelFormat.IPF_RGB_888)
+    """Convert RGB, RGBA or grayscale numpy array to DCV ImageData."""
+    return convertMat2ImageData(image)
 
 
 def image_data_to_np(image_data: ImageData) -> np.ndarray:
     """Convert DCV ImageData to RGB numpy array."""
     fmt = image_data.get_image_pixel_format()
-    w = image_data.get_width()
-    h = image_data.get_height()
-    stride = image_data.get_stride()
-    buf = image_data.get_bytes()
-    if fmt == EnumImagePixelFormat.IPF_GRAYSCALED:
-        arr = np.frombuffer(buf, dtype=np.uint8).reshape((h, stride))
-        gray = arr[:, :w]
-        return cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
-    if fmt == EnumImagePixelFormat.IPF_BINARY_8:
-        arr = np.frombuffer(buf, dtype=np.uint8).reshape((h, stride))
-        gray = arr[:, :w]
-        return cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
-    if fmt == EnumImagePixelFormat.IPF_BINARY_8_INVERTED:
-        # DCV returns inverted 8-bit binary (0=white, 255=black); flip it back.
-        arr = np.frombuffer(buf, dtype=np.uint8).reshape((h, stride))
-        gray = 255 - arr[:, :w]
-        return cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
-    if fmt in (EnumImagePixelFormat.IPF_BINARY, EnumImagePixelFormat.IPF_BINARYINVERTED):
-        # 1-bit packed binary: unpack bits and scale to 0/255.
-        arr = np.frombuffer(buf, dtype=np.uint8).reshape((h, stride))
-        bits = np.unpackbits(arr, axis=1)[:, :w] * 255
-        if fmt == EnumImagePixelFormat.IPF_BINARYINVERTED:
-            bits = 255 - bits
-        return cv2.cvtColor(bits.astype(np.uint8), cv2.COLOR_GRAY2RGB)
-    if fmt == EnumImagePixelFormat.IPF_RGB_888:
-        arr = np.frombuffer(buf, dtype=np.uint8).reshape((h, stride))
-        arr = arr[:, :w * 3]
-        return arr.reshape((h, w, 3))
+    # Strides, 1-bit unpacking and inverted binaries are handled by docscanner.
+    mat = convertNormalizedImage2Mat(image_data)
+    if mat.ndim == 2:
+        return cv2.cvtColor(mat, cv2.COLOR_GRAY2RGB)
     if fmt == EnumImagePixelFormat.IPF_BGR_888:
-        arr = np.frombuffer(buf, dtype=np.uint8).reshape((h, stride))
-        arr = arr[:, :w * 3]
-        bgr = arr.reshape((h, w, 3))
-        return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
-    if fmt == EnumImagePixelFormat.IPF_ARGB_8888:
-        arr = np.frombuffer(buf, dtype=np.uint8).reshape((h, stride))
-        arr = arr[:, :w * 4]
-        return cv2.cvtColor(arr.reshape((h, w, 4)), cv2.COLOR_RGBA2RGB)
-    # Fallback: assume RGB
-    arr = np.frombuffer(buf, dtype=np.uint8).reshape((h, stride))
-    arr = arr[:, :w * 3]
-    return arr.reshape((h, w, 3))
+        return cv2.cvtColor(mat, cv2.COLOR_BGR2RGB)
+    if mat.shape[2] == 4:
+        return cv2.cvtColor(mat, cv2.COLOR_RGBA2RGB)
+    return mat
 
 
 class DCVScanner:
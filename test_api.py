@@ -4,6 +4,7 @@ from docscanner import *
 import numpy as np
 import cv2
 import time
+import os
 
 print(docscanner.__version__)
 # set license
@@ -120,6 +121,446 @@ def test_detectMatAsync():
     scanner.clearAsyncListener()
 
 
+def test_concurrentDetect():
+    print('')
+    print('Test concurrent detect() on a shared scanner')
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    image = cv2.imread("images/1.png")
+    expected = len(scanner.detect(image))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        counts = list(executor.map(lambda _: len(scanner.detect(image)), range(8)))
+    assert counts == [expected] * 8
+    assert scanner.pool.created <= scanner.pool.size
+
+
+def test_detectBatch():
+    print('')
+    print('Test detect_batch()')
+
+    image = cv2.imread("images/1.png")
+    inputs = ["images/1.png", image, "images/missing.png"]
+    outputs = list(scanner.detect_batch(inputs, workers=2, ordered=True))
+    assert [index for index, _ in outputs] == [0, 1, 2]
+    assert len(outputs[0][1]) > 0
+    assert len(outputs[1][1]) > 0
+    assert isinstance(outputs[2][1], Exception)
+    assert outputs[0][1][0].source == "images/1.png"
+
+
+def test_detectAndNormalize():
+    print('')
+    print('Test detectAndNormalize()')
+
+    results = scanner.detectAndNormalize("images/1.png", EnumImageColourMode.ICM_GRAYSCALE)
+    assert len(results) > 0
+    for result in results:
+        assert result.normalized_image is not None
+        assert result.normalized_image.ndim == 2
+        assert result.source == "images/1.png"
+
+
+def test_detectAndNormalizeOffset():
+    print('')
+    print('Test detectAndNormalize() on a document away from the top-left corner')
+
+    image = cv2.imread("images/1.png")
+    height, width = image.shape[:2]
+    canvas = np.full((height * 2, width * 2, 3), 60, dtype=np.uint8)
+    canvas[height:, width:] = image
+    results = scanner.detectAndNormalize(canvas)
+    assert len(results) > 0
+    assert results[0].normalized_image is not None
+    assert results[0].quad[:, 0].min() > width / 2
+    assert results[0].quad[:, 1].min() > height / 2
+
+
+def test_normalizeMany():
+    print('')
+    print('Test normalize_many()')
+
+    image = cv2.imread("images/1.png")
+    results = scanner.detect("images/1.png") + scanner.detect(image)
+    assert len(results) > 1
+    images = scanner.normalize_many(results, EnumImageColourMode.ICM_COLOUR)
+    assert len(images) == len(results)
+    for result, normalized_image in zip(results, images):
+        assert normalized_image is not None
+        assert result.normalized_image is normalized_image
+
+
+def test_sourceCache():
+    print('')
+    print('Test decoded-source cache')
+
+    cached_scanner = docscanner.createInstance(cache_bytes=64 * 1024 * 1024)
+    results = cached_scanner.detect("images/1.png")
+    assert len(results) > 0
+    for colour in (EnumImageColourMode.ICM_COLOUR, EnumImageColourMode.ICM_GRAYSCALE):
+        assert cached_scanner.normalize(results[0], colour) is not None
+    stats = cached_scanner.cache.stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 2
+
+
+def test_convertNormalizedImage2Mat():
+    print('')
+    print('Test convertNormalizedImage2Mat() with padded rows')
+
+    gray = np.random.randint(0, 256, (5, 8), dtype=np.uint8)
+    image = ImageData(gray.tobytes(), 6, 5, 8, EnumImagePixelFormat.IPF_GRAYSCALED)
+    assert np.array_equal(convertNormalizedImage2Mat(image), gray[:, :6])
+    assert convertNormalizedImage2Mat(image, copy=True).flags.writeable
+
+    bits = np.random.randint(0, 2, (3, 13)).astype(np.uint8)
+    packed = np.hstack([np.packbits(bits, axis=1), np.zeros((3, 2), dtype=np.uint8)])
+    image = ImageData(packed.tobytes(), 13, 3, 4, EnumImagePixelFormat.IPF_BINARY)
+    assert np.array_equal(convertNormalizedImage2Mat(image), bits * 255)
+
+    narrow = np.array([[1, 0, 1], [0, 1, 1]], dtype=np.uint8)
+    image = ImageData(np.packbits(narrow, axis=1).tobytes(), 3, 2, 1, EnumImagePixelFormat.IPF_BINARY)
+    assert np.array_equal(convertNormalizedImage2Mat(image), narrow * 255)
+
+    padded = np.hstack([narrow * 255, np.zeros((2, 1), dtype=np.uint8)])
+    image = ImageData(padded.tobytes(), 3, 2, 4, EnumImagePixelFormat.IPF_BINARY)
+    assert np.array_equal(convertNormalizedImage2Mat(image), narrow * 255)
+
+    bytewise = np.random.randint(0, 2, (3, 8)).astype(np.uint8) * 255
+    image = ImageData(bytewise.tobytes(), 8, 3, 8, EnumImagePixelFormat.IPF_BINARY)
+    assert np.array_equal(convertNormalizedImage2Mat(image), bytewise)
+
+
+def test_documentResultQuads():
+    print('')
+    print('Test DocumentResult quad storage and bulk export')
+
+    from docscanner.geometry import stack_quads, quads_to_records
+
+    result = DocumentResult(quad=[[1, 2], [3, 4], [5, 6], [7, 8]])
+    assert (result.x1, result.y1, result.x4, result.y4) == (1, 2, 7, 8)
+    result.x1 = 10
+    assert result.quad[0, 0] == 10
+    quads = stack_quads([result, result])
+    assert quads.shape == (2, 4, 2) and quads.dtype == np.float32
+    assert list(quads_to_records([result])['x1']) == [10]
+
+
+def test_frameBuffer():
+    print('')
+    print('Test bounded frame buffer counters')
+
+    frame_scanner = docscanner.createInstance(frame_buffer_size=1, frame_overflow=DROP_OLDEST)
+    frame_scanner.addAsyncListener(lambda results: None)
+    image = cv2.imread("images/1.png")
+    for _ in range(20):
+        frame_scanner.detectMatAsync(image)
+    sleep(1)
+    frame_scanner.clearAsyncListener()
+
+    stats = frame_scanner.fetcher.stats()
+    assert stats['enqueued'] == 20
+    assert stats['dropped'] + stats['processed'] == 20
+    assert stats['processed'] > 0
+    assert stats['buffered'] == 0
+    assert stats['max_depth'] == 1
+
+
+def test_asyncDetect():
+    print('')
+    print('Test AsyncDocumentScanner')
+
+    import asyncio
+    from docscanner.aio import AsyncDocumentScanner
+
+    async def run():
+        async with AsyncDocumentScanner(pool_size=2) as async_scanner:
+            results = await asyncio.gather(*[async_scanner.detect("images/1.png") for _ in range(4)])
+            assert all(len(documents) > 0 for documents in results)
+
+            image = cv2.imread("images/1.png")
+            streamed = []
+            async for documents in async_scanner.stream([image] * 5):
+                streamed.append(documents)
+            assert 0 < len(streamed) <= 5
+            assert all(isinstance(documents, list) for documents in streamed)
+            assert any(len(documents) > 0 and documents[0].normalized_image is not None
+                       for documents in streamed)
+
+    asyncio.run(run())
+
+
+def test_detectionMaxSide():
+    print('')
+    print('Test downscaled detection')
+
+    from docscanner.geometry import quad_iou
+
+    image = cv2.imread("images/1.png")
+    full = scanner.detect(image)
+    small_scanner = docscanner.createInstance(pool_size=1, detection_max_side=640)
+    results = small_scanner.detect(image)
+    assert len(results) > 0
+    assert quad_iou(results[0].quad, full[0].quad) > 0.9
+    assert small_scanner.normalize(results[0], EnumImageColourMode.ICM_COLOUR) is not None
+
+
+def test_detectOnlyListener():
+    print('')
+    print('Test detect-only async listener')
+
+    found = []
+
+    def callback(results):
+        for result in results:
+            assert result.normalized_image is None
+            found.append(result.quad)
+
+    listener_scanner = docscanner.createInstance(pool_size=1)
+    assert listener_scanner.addAsyncListener(callback, normalize=False)
+    image = cv2.imread("images/1.png")
+    for _ in range(5):
+        listener_scanner.detectMatAsync(image)
+        sleep(0.2)
+    listener_scanner.clearAsyncListener()
+    assert len(found) > 0
+
+
+def test_frameHistory():
+    print('')
+    print('Test normalize() from the frame history')
+
+    latest = []
+    history_scanner = docscanner.createInstance(pool_size=1, frame_history=4)
+    history_scanner.addAsyncListener(lambda results: latest.extend(results), normalize=False)
+    image = cv2.imread("images/1.png")
+    for _ in range(3):
+        history_scanner.detectMatAsync(image)
+        sleep(0.2)
+    history_scanner.clearAsyncListener()
+
+    assert len(latest) > 0
+    assert latest[-1].frame_id is not None
+    assert history_scanner.normalize(latest[-1]) is not None
+
+    idle_scanner = docscanner.createInstance(pool_size=1, frame_history=4)
+    assert not idle_scanner.detectMatAsync(image)
+    assert idle_scanner.fetcher.stats()['enqueued'] == 0
+    assert idle_scanner.fetcher.frame(0) is None
+
+
+def test_latestDispatch():
+    print('')
+    print('Test latest-result dispatch')
+
+    from docscanner.dispatch import LatestDispatcher
+
+    delivered = []
+
+    def slow_listener(results):
+        sleep(0.05)
+        delivered.append(results)
+
+    dispatcher = LatestDispatcher(slow_listener)
+    for i in range(20):
+        dispatcher.submit(i)
+    sleep(0.3)
+    dispatcher.close()
+
+    stats = dispatcher.stats()
+    assert delivered[-1] == 19
+    assert stats['delivered'] + stats['coalesced'] == 20
+
+    dispatch_scanner = docscanner.createInstance(pool_size=1)
+    dispatch_scanner.addAsyncListener(slow_listener, dispatch=DISPATCH_LATEST)
+    assert dispatch_scanner.dispatcher is not None
+    dispatch_scanner.addAsyncListener(slow_listener, dispatch=DISPATCH_INLINE)
+    assert dispatch_scanner.dispatcher is None
+    dispatch_scanner.addAsyncListener(slow_listener, dispatch=DISPATCH_LATEST)
+    dispatch_scanner.clearAsyncListener()
+    assert dispatch_scanner.dispatcher is None
+    assert 'dispatch' not in dispatch_scanner.stats()
+
+
+def test_changeFilter():
+    print('')
+    print('Test change-only notifications')
+
+    from docscanner.dispatch import ChangeFilter
+
+    calls = []
+    change_filter = ChangeFilter(calls.append, min_change=2.0)
+    quad = np.array([[0, 0], [100, 0], [100, 100], [0, 100]], dtype=np.float32)
+    for offset in (0, 0.5, 3):
+        change_filter([docscanner.DocumentResult(quad=quad + offset)])
+    change_filter([])
+    change_filter([])
+    assert [len(results) for results in calls] == [1, 1, 0]
+    assert change_filter.stats() == {'delivered': 3, 'suppressed': 2}
+
+    filter_scanner = docscanner.createInstance(pool_size=1)
+    filter_scanner.addAsyncListener(lambda results: None, min_iou=0.9)
+    assert filter_scanner.change_filter is not None
+    assert filter_scanner.change_filter.min_iou == 0.9
+    filter_scanner.clearAsyncListener()
+
+
+def test_quadTracker():
+    print('')
+    print('Test optical-flow quad tracking')
+
+    from docscanner.tracking import QuadTracker
+
+    document = cv2.imread("images/1.png")
+    canvas = np.full((1080, 1920, 3), 60, dtype=np.uint8)
+    height, width = 600, 450
+    quad = np.array([[[700, 200], [700 + width, 200], [700 + width, 200 + height], [700, 200 + height]]], dtype=np.float32)
+
+    def shifted(dx):
+        frame = canvas.copy()
+        frame[200:200 + height, 700 + dx:700 + dx + width] = cv2.resize(document, (width, height))
+        return frame
+
+    tracker = QuadTracker(redetect_interval=5, smoothing=0.0)
+    first = tracker.prepare(shifted(0))
+    assert tracker.track(first) is None
+    tracker.anchor(first, quad)
+    tracked = tracker.track(tracker.prepare(shifted(6)))
+    assert tracked is not None
+    assert np.abs(tracked - (quad + [6, 0])).max() < 1.5
+    assert tracker.track(tracker.prepare(canvas)) is None
+    assert tracker.stats()['lost'] == 1
+
+
+def test_roiSearch():
+    print('')
+    print('Test region-of-interest search')
+
+    from docscanner.roi import RoiSearch
+
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    roi = RoiSearch(margin=0.1, max_misses=2)
+    view, offset = roi.crop(frame)
+    assert offset is None and view.shape == frame.shape
+    roi.update(np.array([[[800, 300], [1200, 300], [1200, 800], [800, 800]]], dtype=np.float32), False)
+    view, offset = roi.crop(frame)
+    assert tuple(offset) == (760, 250)
+    assert view.shape[:2] == (601, 481) and np.shares_memory(view, frame)
+    roi.update(np.zeros((0, 4, 2), dtype=np.float32), True)
+    assert roi.crop(frame)[1] is not None
+    roi.update(np.zeros((0, 4, 2), dtype=np.float32), True)
+    assert roi.crop(frame)[1] is None
+    assert roi.stats()['fallbacks'] == 1
+
+
+def test_scanStream():
+    print('')
+    print('Test scan_stream()')
+
+    stream_scanner = docscanner.createInstance(pool_size=2)
+    image = cv2.imread("images/1.png")
+    frames = (image for _ in range(5))
+    output = list(stream_scanner.scan_stream(frames, prefetch=2, colour_mode=EnumImageColourMode.ICM_COLOUR))
+    assert [index for index, _ in output] == list(range(5))
+    for _, results in output:
+        assert not isinstance(results, Exception), results
+        assert len(results) > 0 and results[0].normalized_image is not None
+
+
+def test_scanVideo():
+    print('')
+    print('Test scan_video()')
+
+    image = cv2.imread("images/1.png")
+    height, width = image.shape[:2]
+    path = 'test_pages.avi'
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (width, height))
+    for _ in range(20):
+        writer.write(image)
+    writer.release()
+    try:
+        video_scanner = docscanner.createInstance(pool_size=2)
+        pages = video_scanner.scan_video(path, sample_fps=5)
+        assert len(pages) == 1
+        assert pages[0].result.normalized_image is not None
+    finally:
+        os.remove(path)
+
+
+def test_batchScanFile():
+    print('')
+    print('Test batch scan_file()')
+
+    from docscanner.scripts import scan_file
+
+    batch_scanner = docscanner.createInstance(pool_size=1)
+    record = scan_file(batch_scanner, "images/1.png", 'batch_test', 'png', EnumImageColourMode.ICM_GRAYSCALE)
+    try:
+        assert 'error' not in record, record
+        assert len(record['quads']) == len(record['outputs']) > 0
+        assert record['outputs'][0] == 'batch_test_1.png'
+        assert record['width'] > 0 and record['detect_ms'] >= 0
+    finally:
+        for output in record.get('outputs', []):
+            os.remove(output)
+
+
+def test_syntheticScene():
+    print('')
+    print('Test benchmark scene generator')
+
+    from docscanner.bench import summarize, synthetic_scene
+
+    image, quad = synthetic_scene(1280, 720, seed=3)
+    assert image.shape == (720, 1280, 3)
+    assert quad.shape == (4, 2)
+    assert (quad >= 0).all() and (quad[:, 0] <= 1280).all() and (quad[:, 1] <= 720).all()
+    stats = summarize([1000000, 2000000, 3000000])
+    assert stats['p50_ms'] == 2.0 and stats['count'] == 3
+
+
+def test_instrumentation():
+    print('')
+    print('Test per-stage instrumentation')
+
+    timed_scanner = docscanner.createInstance(instrument=True)
+    seen = []
+    timed_scanner.add_stage_hook(lambda name, ns: seen.append(name))
+    image = cv2.imread("images/1.png")
+    results = timed_scanner.detect(image)
+    assert len(results) > 0
+    assert timed_scanner.normalize(results[0]) is not None
+    stages = timed_scanner.stats()['stages']
+    for name in ('detect.convert', 'detect.capture', 'detect.unpack',
+                 'normalize.settings', 'normalize.capture', 'normalize.unpack'):
+        assert stages[name]['calls'] == 1 and name in seen
+        assert sum(stages[name]['histogram'].values()) == 1
+    assert stages['detect.convert']['bytes'] == image.nbytes
+    assert docscanner.createInstance().stats()['stages'] == {}
+
+
 test_detectFile()
 test_detectMat()
-test_detectMatAsync()
\ No newline at end of file
+test_detectMatAsync()
+test_concurrentDetect()
+test_detectBatch()
+test_detectAndNormalize()
+test_detectAndNormalizeOffset()
+test_normalizeMany()
+test_sourceCache()
+test_convertNormalizedImage2Mat()
+test_documentResultQuads()
+test_frameBuffer()
+test_asyncDetect()
+test_detectionMaxSide()
+test_detectOnlyListener()
+test_frameHistory()
+test_latestDispatch()
+test_changeFilter()
+test_quadTracker()
+test_roiSearch()
+test_scanStream()
+test_scanVideo()
+test_batchScanFile()
+test_syntheticScene()
+test_instrumentation()